@@ -1,5 +1,15 @@
 import streamlit as st
-import pandas as pd
+from streamlit_gsheets import GSheetsConnection
+from applicant_filters import add_indicator_columns
+from applicant_schema import parse_applicants
+from candidate_matching import load_shortlists, refresh_shortlists
+from job_board import (
+    JOB_LEVELS,
+    PostingIndex,
+    count_matching_applicants,
+    load_postings,
+    normalize_postings,
+)
 
 # List of predefined locations
 locations_list = [
@@ -7,68 +17,30 @@ locations_list = [
     "Phra Nakhon", "Ratchathewi", "Sathon", "Watthana"
 ]
 
-# Sample mock data for job posts with some positions having negotiable salaries
-job_data = [
-    {
-        "Position": "Software Engineer",
-        "Salary Range (THB)": "30,000 - 50,000",
-        "Experience Needed (Years)": "2 - 3",
-        "Job Level": "Junior",
-        "Location": "Bang Kapi"
-    },
-    {
-        "Position": "Data Scientist",
-        "Salary Range (THB)": "Negotiable",
-        "Experience Needed (Years)": "3 - 7",
-        "Job Level": "Senior",
-        "Location": "Chatuchak"
-    },
-    {
-        "Position": "Project Manager",
-        "Salary Range (THB)": "60,000 - 100,000",
-        "Experience Needed (Years)": "5 - 10",
-        "Job Level": "Manager",
-        "Location": "Ratchathewi"
-    },
-    {
-        "Position": "Marketing Specialist",
-        "Salary Range (THB)": "Negotiable",
-        "Experience Needed (Years)": "0 - 1",
-        "Job Level": "Junior",
-        "Location": "Sathon"
-    },
-    {
-        "Position": "UX/UI Designer",
-        "Salary Range (THB)": "35,000 - 60,000",
-        "Experience Needed (Years)": "2 - 3",
-        "Job Level": "Mid",
-        "Location": "Huai Khwang"
-    },
-    {
-        "Position": "System Architect",
-        "Salary Range (THB)": "70,000 - 120,000",
-        "Experience Needed (Years)": 6,
-        "Job Level": "Senior",
-        "Location": "Watthana"
-    },
-    {
-        "Position": "Business Analyst",
-        "Salary Range (THB)": "Negotiable",
-        "Experience Needed (Years)": "4 - 6",
-        "Job Level": "Mid",
-        "Location": "Phra Nakhon"
-    },
-    {
-        "Position": "HR Manager",
-        "Salary Range (THB)": "Negotiable",
-        "Experience Needed (Years)": 7,
-        "Job Level": "Manager",
-        "Location": "Khlong Toei"
-    }
-]
+# Load and normalize postings once; the index is reused across reruns
+@st.cache_resource
+def load_posting_index():
+    return PostingIndex(normalize_postings(load_postings()))
+
+# Load applicants from Google Sheets for the matching counts
+@st.cache_data
+def load_applicants():
+    conn = st.connection("gsheets", type=GSheetsConnection)
+    df = parse_applicants(conn.read())
+    return add_indicator_columns(df, columns=["Preferred Location"])
+
+# Vectorized "matching applicants" count for every posting
+@st.cache_data
+def matching_counts():
+    return count_matching_applicants(load_posting_index().postings, load_applicants())
 
-# Convert mock data to DataFrame
-df_jobs = pd.DataFrame(job_data)
+# Precomputed top-k candidates per posting, read from the match cache
+@st.cache_data
+def cached_shortlists():
+    return load_shortlists()
+
+posting_index = load_posting_index()
+df_jobs = posting_index.postings
 
 # Streamlit UI
 st.title("📢 Job Postings")
@@ -78,26 +50,78 @@ st.markdown("""
 Welcome to the **Job Postings** page. Below are the job positions currently available.
 """)
 
+try:
+    match_counts = matching_counts()
+except Exception as e:
+    match_counts = None
+    st.warning(f"Applicant data unavailable, matching counts are hidden: {e}")
+
+# Embed only new postings/resumes and update the candidate shortlists
+if st.button("🎯 Refresh candidate shortlists"):
+    with st.spinner(":green[Embedding new postings and resumes...]"):
+        try:
+            _, stats = refresh_shortlists(df_jobs)
+            cached_shortlists.clear()
+            st.success(", ".join(f"{count} {name}" for name, count in stats.items()))
+        except Exception as e:
+            st.error(f"Could not refresh shortlists: {e}", icon="⛔️")
+shortlists = cached_shortlists()
+
 # Display job posts as cards
 st.markdown("### Available Job Positions")
 
-# Loop through the data and display each job as a card
-for _, row in df_jobs.iterrows():
+# Search filters
+col1, col2 = st.columns(2)
+with col1:
+    search_text = st.text_input("🔎 Search positions")
+    selected_levels = st.multiselect("Job Level", JOB_LEVELS)
+with col2:
+    min_salary = st.number_input("Minimum Salary (THB)", min_value=0, step=5000, value=0)
+    selected_locations = st.multiselect("Location", locations_list)
+include_negotiable = st.checkbox("Include negotiable salaries", value=True)
+
+positions = posting_index.search(
+    levels=selected_levels,
+    locations=selected_locations,
+    min_salary=min_salary,
+    include_negotiable=include_negotiable,
+    text=search_text,
+)
+
+# Pagination: only the postings on the current page are rendered
+page_size = 10
+total_pages = max(1, -(-len(positions) // page_size))
+page = st.number_input(f"Page (1 - {total_pages})", min_value=1, max_value=total_pages, value=1, step=1)
+page_positions = positions[(page - 1) * page_size:page * page_size]
+st.caption(f"{len(positions)} positions found")
+
+# Loop through the current page and display each job as a card
+for position in page_positions:
+    row = df_jobs.iloc[position]
     with st.container():
         # Use columns to create a nice layout
         col1, col2 = st.columns([3, 1])
         
         with col1:
             st.markdown(f"**{row['Position']}**")
-            if row["Salary Range (THB)"] == "Negotiable":
+            if row["Negotiable"]:
                 st.markdown("**Salary:** Negotiable")
             else:
                 st.markdown(f"**Salary Range:** {row['Salary Range (THB)']}")
             st.markdown(f"**Experience Needed:** {row['Experience Needed (Years)']} years")
             st.markdown(f"**Location:** {row['Location']}")
+            if match_counts is not None:
+                st.markdown(f"**Matching Applicants:** {match_counts[position]}")
+            
+            # Top candidates by resume similarity, no LLM call needed
+            candidates = shortlists.get(row['Posting ID'])
+            if candidates:
+                with st.expander(f"🎯 Top {len(candidates)} candidates"):
+                    for resume_id, score in candidates:
+                        st.markdown(f"- {resume_id} (similarity {score:.2f})")
             
             # Add the "Apply this position" button
-            if st.button("Apply this position", key=row['Position']):
+            if st.button("Apply this position", key=row['Posting ID']):
                 st.write(f"🔗 Application link for **{row['Position']}** goes here.")
         
         with col2:
@@ -0,0 +1,94 @@
+import io
+
+import pandas as pd
+import streamlit as st
+
+from applicant_schema import join_list_columns
+
+# Rows converted per chunk when writing an export
+EXPORT_CHUNK_ROWS = 5000
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "Parquet (compressed)": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+
+def iter_csv_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield the CSV export as encoded byte chunks of ``chunk_rows`` rows each."""
+    yield df.iloc[:0].to_csv(index=False).encode("utf-8")
+    for start in range(0, len(df), chunk_rows):
+        # List columns are written the way the form stores them, comma-joined
+        chunk = join_list_columns(df.iloc[start:start + chunk_rows])
+        yield chunk.to_csv(index=False, header=False).encode("utf-8")
+
+
+def write_csv(df, stream, chunk_rows=EXPORT_CHUNK_ROWS):
+    for chunk in iter_csv_chunks(df, chunk_rows):
+        stream.write(chunk)
+
+
+def write_parquet(df, stream, chunk_rows=EXPORT_CHUNK_ROWS, compression="zstd"):
+    # pyarrow ships with streamlit, import it only when a Parquet export is requested
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(stream, schema, compression=compression) as writer:
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def build_export(df, export_format, chunk_rows=EXPORT_CHUNK_ROWS):
+    buffer = io.BytesIO()
+    if EXPORT_FORMATS[export_format]["extension"] == "parquet":
+        write_parquet(df, buffer, chunk_rows)
+    else:
+        write_csv(df, buffer, chunk_rows)
+    buffer.seek(0)
+    return buffer
+
+
+def release_export(state_key):
+    st.session_state.pop(state_key, None)
+
+
+def render_export_controls(df, key, file_stem, data_version=None):
+    """Export ``df`` only when asked, then offer the prepared file for download.
+
+    The prepared file is kept in session state until it is downloaded or the format,
+    the rows or ``data_version`` (a hash of the loaded data) change.
+    st.download_button needs the whole file, so the export cannot be streamed; the
+    buffer is released as soon as the download is clicked instead.
+    """
+    state_key = f"{key}_export"
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        export_format = st.radio("Export format", list(EXPORT_FORMATS), horizontal=True, key=f"{key}_format")
+    with col2:
+        prepare = st.button(f"📦 Prepare export ({len(df)} rows)", key=f"{key}_prepare")
+
+    # Which rows and columns are selected; cell contents are covered by data_version
+    signature = (export_format, tuple(df.columns), hash(pd.util.hash_pandas_object(df.index).to_numpy().tobytes()),
+                 data_version)
+    prepared = st.session_state.get(state_key)
+    if prepared is not None and prepared["signature"] != signature:
+        prepared = st.session_state[state_key] = None
+
+    if prepare:
+        with st.spinner(":green[Preparing export...]"):
+            prepared = {"signature": signature, "buffer": build_export(df, export_format)}
+        st.session_state[state_key] = prepared
+
+    if prepared is not None:
+        file_format = EXPORT_FORMATS[export_format]
+        st.download_button(
+            label=f"⬇️ Download {export_format}",
+            data=prepared["buffer"],
+            file_name=f"{file_stem}.{file_format['extension']}",
+            mime=file_format["mime"],
+            key=f"{key}_download",
+            on_click=release_export,
+            args=(state_key,),
+        )
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# Columns that the application form saves as comma-joined lists (", ".join(...)),
+# parsed into list columns by applicant_schema
+MULTI_VALUE_COLUMNS = ["Languages", "Work Environment", "Job Type", "Preferred Location"]
+
+# Prefix for the boolean indicator columns derived from MULTI_VALUE_COLUMNS
+INDICATOR_PREFIX = "__has__"
+
+
+def indicator_column(column, value):
+    return f"{INDICATOR_PREFIX}{column}::{value}"
+
+
+def add_indicator_columns(df, columns=MULTI_VALUE_COLUMNS):
+    """Parse each list or comma-joined column once into boolean indicator columns."""
+    indicators = []
+    for column in columns:
+        values = df[column]
+        if values.map(lambda v: isinstance(v, list)).any():
+            # List columns from applicant_schema.parse_applicants
+            values = values.map(lambda v: v if isinstance(v, list) else []).str.join(",")
+        else:
+            # Normalise stray whitespace around the commas before splitting
+            values = values.fillna("").astype(str).str.strip().str.replace(r"\s*,\s*", ",", regex=True)
+        dummies = values.str.get_dummies(sep=",").astype(bool)
+        dummies = dummies.drop(columns=[""], errors="ignore")
+        dummies.columns = [indicator_column(column, value) for value in dummies.columns]
+        indicators.append(dummies)
+    if not indicators:
+        return df
+    return pd.concat([df] + indicators, axis=1)
+
+
+def indicator_options(df, column):
+    """Return the sorted distinct values found in a multi-valued column."""
+    prefix = indicator_column(column, "")
+    return sorted(c[len(prefix):] for c in df.columns if c.startswith(prefix))
+
+
+def drop_indicator_columns(df):
+    return df.loc[:, [c for c in df.columns if not c.startswith(INDICATOR_PREFIX)]]
+
+
+def multi_value_mask(df, column, selected):
+    """Rows holding any of the selected values in a multi-valued column.
+
+    Selecting every known value leaves the column unrestricted, so rows with an
+    empty entry are kept just like an untouched single-valued filter keeps them.
+    """
+    options = indicator_options(df, column)
+    selected = [value for value in selected if value in options]
+    if set(selected) == set(options):
+        return np.ones(len(df), dtype=bool)
+    if not selected:
+        return np.zeros(len(df), dtype=bool)
+    return df[[indicator_column(column, value) for value in selected]].to_numpy().any(axis=1)
+
+
+def build_filter_mask(df, min_salary=None, max_salary=None, min_experience=None,
+                      education=None, near_bts=None, multi_values=None):
+    """Combine every advanced filter into a single boolean mask over ``df``.
+
+    ``multi_values`` maps a column from MULTI_VALUE_COLUMNS to its selected values.
+    Filters left as None are not applied.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    # Nullable Int64 columns: missing values become NaN and fail every range check
+    salary = pd.to_numeric(df["Expected Salary"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    experience = pd.to_numeric(df["Years of Experience"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    if min_salary is not None:
+        mask &= salary >= min_salary
+    if max_salary is not None:
+        mask &= salary <= max_salary
+    if min_experience is not None:
+        mask &= experience >= min_experience
+    if education is not None:
+        mask &= df["Highest Level of Education"].isin(education).to_numpy(dtype=bool, na_value=False)
+    if near_bts is not None:
+        mask &= df["Near BTS/MRT Line"].isin(near_bts).to_numpy(dtype=bool, na_value=False)
+    for column, selected in (multi_values or {}).items():
+        mask &= multi_value_mask(df, column, selected)
+    return mask
@@ -0,0 +1,126 @@
+import pandas as pd
+
+# Columns in the order the application form appends them to the Google Sheet
+SHEET_COLUMNS = [
+    "Languages", "Gender", "First Name", "Last Name", "Birth Date", "Email", "Phone",
+    "Desired Job Role", "Work Environment", "Job Type", "Preferred Location", "Near BTS/MRT Line",
+    "Expected Salary", "Years of Experience", "Highest Level of Education", "Skills", "Resume File Name"
+]
+
+# Column order used by the database and analysis pages
+DISPLAY_COLUMNS = [
+    "First Name", "Last Name", "Gender", "Birth Date", "Email", "Phone (+66)",
+    "Highest Level of Education", "Languages", "Years of Experience", "Skills",
+    "Desired Job Role", "Expected Salary", "Work Environment", "Job Type",
+    "Preferred Location", "Near BTS/MRT Line", "Resume File Name"
+]
+
+# Options offered by the application form; categorical columns keep this order
+GENDERS = ["Male", "Female", "Other"]
+JOB_ROLES = [
+    "Software Development", "Data Science", "Product Management", "Design",
+    "Marketing", "Sales", "Human Resources", "Customer Support",
+    "Finance", "Project Management", "Content Creation", "UI/UX Design",
+    "Business Analysis", "Engineering", "Cybersecurity", "Operations",
+    "Production", "Other"
+]
+EDUCATION_LEVELS = ["High School", "Associate Degree", "Bachelor's Degree", "Master's Degree", "PhD"]
+
+CATEGORY_COLUMNS = {
+    "Gender": GENDERS,
+    "Desired Job Role": JOB_ROLES,
+    "Highest Level of Education": EDUCATION_LEVELS,
+}
+INTEGER_COLUMNS = ["Expected Salary", "Years of Experience"]
+BOOLEAN_COLUMNS = ["Near BTS/MRT Line"]
+# Saved by the form as ", ".join(values); parsed into Python lists
+LIST_COLUMNS = ["Languages", "Work Environment", "Job Type", "Preferred Location"]
+
+TRUE_STRINGS = {"true", "yes", "1"}
+FALSE_STRINGS = {"false", "no", "0", ""}
+
+
+def to_sheet_row(record):
+    """Turn a form submission (column -> value) into a sheet row in SHEET_COLUMNS order."""
+    row = []
+    for column in SHEET_COLUMNS:
+        value = record[column]
+        if column in LIST_COLUMNS:
+            value = ", ".join(value)
+        row.append(value)
+    return row
+
+
+def align_columns(raw):
+    """Select the sheet columns by header name.
+
+    Falls back to the form's positional order only for sheets whose header row
+    does not carry the column names, and refuses frames of the wrong width
+    instead of silently shifting every column.
+    """
+    headers = {str(column).strip(): column for column in raw.columns}
+    if all(column in headers for column in SHEET_COLUMNS):
+        df = raw[[headers[column] for column in SHEET_COLUMNS]]
+        df.columns = SHEET_COLUMNS
+        return df
+    if len(raw.columns) != len(SHEET_COLUMNS):
+        missing = [column for column in SHEET_COLUMNS if column not in headers]
+        raise ValueError(f"Applicant sheet has {len(raw.columns)} columns, expected {len(SHEET_COLUMNS)}; "
+                         f"missing: {', '.join(missing)}")
+    df = raw.copy()
+    df.columns = SHEET_COLUMNS
+    return df
+
+
+def parse_bool(values):
+    text = values.astype("string").str.strip().str.lower()
+    parsed = pd.Series(pd.NA, index=values.index, dtype="boolean")
+    parsed[text.isin(TRUE_STRINGS).fillna(False).to_numpy()] = True
+    parsed[text.isin(FALSE_STRINGS).fillna(False).to_numpy()] = False
+    return parsed
+
+
+def parse_list(values):
+    text = values.fillna("").astype(str).str.strip()
+    return text.str.split(r"\s*,\s*", regex=True).map(lambda items: [item for item in items if item])
+
+
+def parse_applicants(raw):
+    """Convert raw sheet rows once into compact, typed columns in DISPLAY_COLUMNS order."""
+    df = align_columns(raw)
+    typed = pd.DataFrame(index=df.index)
+    for column in SHEET_COLUMNS:
+        values = df[column]
+        if column in CATEGORY_COLUMNS:
+            known = CATEGORY_COLUMNS[column]
+            extra = sorted(set(values.dropna().astype(str)) - set(known))
+            typed[column] = pd.Categorical(values.astype("string"), categories=known + extra)
+        elif column in INTEGER_COLUMNS:
+            typed[column] = pd.to_numeric(values, errors="coerce").round().astype("Int64")
+        elif column in BOOLEAN_COLUMNS:
+            typed[column] = parse_bool(values)
+        elif column in LIST_COLUMNS:
+            typed[column] = parse_list(values)
+        elif column == "Birth Date":
+            typed[column] = pd.to_datetime(values, errors="coerce")
+        else:
+            # Phone stays text to preserve leading zeros
+            typed[column] = values.astype("string")
+    typed = typed.rename(columns={"Phone": "Phone (+66)"})
+    return typed[DISPLAY_COLUMNS]
+
+
+def join_list_columns(df):
+    """Comma-join list columns back to text, e.g. for CSV export or display."""
+    columns = [column for column in LIST_COLUMNS if column in df.columns]
+    if not columns:
+        return df
+    df = df.copy()
+    for column in columns:
+        df[column] = df[column].str.join(", ")
+    return df
+
+
+def data_version(df):
+    """Content hash of parsed applicants, used to key caches on the loaded data."""
+    return hash(pd.util.hash_pandas_object(join_list_columns(df), index=False).to_numpy().tobytes())
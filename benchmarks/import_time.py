@@ -0,0 +1,102 @@
+"""Import-time benchmark for the AI page (pages/4_AI_feature.py).
+
+Compares what the page imports at module top before and after deferring the
+heavy modules. Both module lists are read from the page source, so they follow
+the page as it changes. "Cold" is a fresh interpreter (first page load after the server
+starts); "warm" is a second import in the same process (a script rerun).
+
+    python benchmarks/import_time.py --repeat 5
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_PATH = os.path.join(REPO_ROOT, "pages", "4_AI_feature.py")
+
+
+def module_level_imports(tree):
+    """Modules imported when the page script runs, i.e. outside functions and classes."""
+    modules = []
+
+    def visit(nodes):
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0:
+                modules.append(node.module)
+            visit(ast.iter_child_nodes(node))
+
+    visit(tree.body)
+    return list(dict.fromkeys(modules))
+
+
+def page_imports(path=PAGE_PATH):
+    """Return (eager, deferred) module lists read from the page source.
+
+    "Deferred" is what the page imports at module level now; "eager" adds the
+    page's HEAVY_IMPORTS, which it used to import at module level as well.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    heavy = next(
+        ast.literal_eval(node.value)
+        for node in tree.body
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "HEAVY_IMPORTS" for t in node.targets)
+    )
+    deferred = module_level_imports(tree)
+    return deferred + [module for module in heavy if module not in deferred], deferred
+
+
+SNIPPET = """
+import importlib, json, sys, time
+modules = json.loads(sys.argv[1])
+def run():
+    start = time.perf_counter()
+    for module in modules:
+        importlib.import_module(module)
+    return time.perf_counter() - start
+cold = run()
+warm = run()
+print(json.dumps([cold, warm]))
+"""
+
+
+def measure(modules, repeat):
+    import json
+
+    cold, warm = [], []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", SNIPPET, json.dumps(modules)],
+            capture_output=True, text=True, check=True, cwd=REPO_ROOT,  # the page's own modules
+        )
+        c, w = json.loads(result.stdout.strip().splitlines()[-1])
+        cold.append(c)
+        warm.append(w)
+    return statistics.median(cold), statistics.median(warm)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per scenario")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<28}{'cold (s)':>10}{'warm (s)':>10}")
+    eager, deferred = page_imports()
+    for name, modules in [("before: eager imports", eager), ("after: deferred imports", deferred)]:
+        try:
+            cold, warm = measure(modules, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<28}failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        print(f"{name:<28}{cold:>10.3f}{warm:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
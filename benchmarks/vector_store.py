@@ -0,0 +1,103 @@
+"""Recall and latency of the quantized vector store against the current Chroma path.
+
+Uses synthetic clustered embeddings with the nomic-embed-text dimension (768), so
+it runs without Ollama. Exact float32 search is the ground truth for recall@k.
+
+    python benchmarks/vector_store.py --chunks 50000 --queries 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantized_store import QuantizedIndex, normalize  # noqa: E402
+
+
+def synthetic_corpus(n, n_queries, dim, clusters, seed):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, n)] + 0.6 * rng.normal(size=(n, dim))
+    queries = vectors[rng.integers(0, n, n_queries)] + 0.3 * rng.normal(size=(n_queries, dim))
+    return normalize(vectors), normalize(queries)
+
+
+def recall_at_k(truth, found):
+    return np.mean([len(set(t) & set(f)) / len(t) for t, f in zip(truth, found)])
+
+
+def time_queries(search, queries):
+    found = []
+    start = time.perf_counter()
+    for query in queries:
+        found.append(search(query))
+    elapsed = time.perf_counter() - start
+    return found, elapsed / len(queries) * 1000
+
+
+def bench_chroma(vectors, queries, k):
+    try:
+        import chromadb
+    except ImportError:
+        return None
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection("bench", metadata={"hnsw:space": "cosine"})
+    ids = [str(i) for i in range(len(vectors))]
+    for start in range(0, len(vectors), 5000):
+        collection.add(ids=ids[start:start + 5000], embeddings=vectors[start:start + 5000].tolist(),
+                       documents=["x"] * len(ids[start:start + 5000]))
+
+    def search(query):
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k)
+        return [int(i) for i in result["ids"][0]]
+
+    return time_queries(search, queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--nprobe", type=int, default=8)
+    args = parser.parse_args()
+
+    vectors, queries = synthetic_corpus(args.chunks, args.queries, args.dim, clusters=max(10, args.chunks // 100), seed=42)
+    truth = [np.argsort(-(vectors @ q))[:args.k] for q in queries]
+    texts = [""] * len(vectors)
+    metadatas = [{"source": f"resume_{i % 1000}.pdf"} for i in range(len(vectors))]
+
+    rows = []
+    float32_bytes = vectors.nbytes
+    with tempfile.TemporaryDirectory() as tmp:
+        for dtype in ("float16", "int8"):
+            path = os.path.join(tmp, dtype)
+            index = QuantizedIndex.build(path, vectors, texts, metadatas, dtype=dtype)
+            size = sum(os.path.getsize(os.path.join(index.data_path, f))
+                       for f in os.listdir(index.data_path) if f.endswith(".npy"))
+            found, latency = time_queries(lambda q: index.search(q, k=args.k, exact=True)[1], queries)
+            rows.append((f"{dtype} flat (mmap)", recall_at_k(truth, found), latency, size))
+            if index.ivf is not None:
+                found, latency = time_queries(lambda q: index.search(q, k=args.k, nprobe=args.nprobe)[1], queries)
+                rows.append((f"{dtype} IVF nprobe={args.nprobe}", recall_at_k(truth, found), latency, size))
+
+        chroma = bench_chroma(vectors, queries, args.k)
+        if chroma is not None:
+            found, latency = chroma
+            rows.append(("chroma (in-memory HNSW)", recall_at_k(truth, found), latency, float32_bytes))
+
+    print(f"{args.chunks} chunks x {args.dim} dims, {args.queries} queries, recall@{args.k} vs exact float32")
+    print(f"{'backend':<28}{'recall':>8}{'ms/query':>10}{'vector MB':>11}")
+    for name, recall, latency, size in rows:
+        print(f"{name:<28}{recall:>8.3f}{latency:>10.2f}{size / 1e6:>11.1f}")
+    if chroma is None:
+        print("chromadb is not installed; Chroma row skipped")
+
+
+if __name__ == "__main__":
+    main()
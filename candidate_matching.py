@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from resume_files import RESUME_FOLDER, list_resumes
+
+# Same embedding model as the AI page's vector database
+EMBEDDING_MODEL = "nomic-embed-text"
+MATCH_CACHE_DIR = ".match_cache"
+TOP_K = 10
+
+# Long resumes are truncated before embedding; the opening pages carry the summary and skills
+MAX_RESUME_CHARS = 8000
+
+
+def posting_text(row):
+    return (
+        f"{row['Position']} ({row['Job Level']}) in {row['Location']}. "
+        f"Experience needed: {row['Experience Needed (Years)']} years. "
+        f"Salary: {row['Salary Range (THB)']} THB."
+    )
+
+
+def resume_text(pdf_path, max_chars=MAX_RESUME_CHARS):
+    import pdfplumber
+
+    parts = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            parts.append(page.extract_text() or "")
+            if sum(len(p) for p in parts) >= max_chars:
+                break
+    return "\n".join(parts)[:max_chars]
+
+
+class EmbeddingStore:
+    """Unit-normalized embeddings keyed by id, persisted to an .npz file.
+
+    Each vector is stored with the fingerprint of the item it was computed from,
+    so only new or changed items are sent to the embedding model.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.vectors = {}
+        self.fingerprints = {}
+        if os.path.exists(path):
+            with np.load(path, allow_pickle=False) as data:
+                for item_id, fingerprint, vector in zip(data["ids"], data["fingerprints"], data["vectors"]):
+                    self.vectors[str(item_id)] = vector
+                    self.fingerprints[str(item_id)] = str(fingerprint)
+
+    def stale(self, fingerprints):
+        return [item_id for item_id, fp in fingerprints.items() if self.fingerprints.get(item_id) != fp]
+
+    def removed(self, fingerprints):
+        return [item_id for item_id in self.vectors if item_id not in fingerprints]
+
+    def update(self, ids, fingerprints, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        for item_id, vector in zip(ids, vectors):
+            self.vectors[item_id] = vector
+            self.fingerprints[item_id] = fingerprints[item_id]
+
+    def remove(self, ids):
+        for item_id in ids:
+            self.vectors.pop(item_id, None)
+            self.fingerprints.pop(item_id, None)
+
+    def matrix(self, ids):
+        if not ids:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([self.vectors[item_id] for item_id in ids])
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        ids = sorted(self.vectors)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            ids=np.array(ids, dtype=str),
+            fingerprints=np.array([self.fingerprints[i] for i in ids], dtype=str),
+            vectors=self.matrix(ids) if ids else np.zeros((0, 0), dtype=np.float32),
+        )
+        os.replace(tmp_path, self.path)
+
+
+def top_k(scores, k):
+    """Indices of the k highest scores per row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+def load_shortlists(cache_dir=MATCH_CACHE_DIR):
+    path = os.path.join(cache_dir, "shortlists.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_shortlists(shortlists, cache_dir=MATCH_CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, "shortlists.json")
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(shortlists, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def refresh_shortlists(postings, resume_folder=RESUME_FOLDER, cache_dir=MATCH_CACHE_DIR,
+                       embeddings=None, k=TOP_K):
+    """Embed new postings/resumes and bring the per-posting top-k candidate lists up to date.
+
+    Only items whose fingerprint changed are embedded. When resumes are only
+    added, existing shortlists are merged with the scores of the new resumes
+    instead of being recomputed. Returns (shortlists, stats).
+    """
+    if embeddings is None:
+        from langchain_ollama import OllamaEmbeddings
+        embeddings = OllamaEmbeddings(model=EMBEDDING_MODEL)
+
+    posting_store = EmbeddingStore(os.path.join(cache_dir, "postings.npz"))
+    resume_store = EmbeddingStore(os.path.join(cache_dir, "resumes.npz"))
+
+    texts = {row["Posting ID"]: posting_text(row) for _, row in postings.iterrows()}
+    posting_fps = {posting_id: hashlib.sha1(text.encode("utf-8")).hexdigest() for posting_id, text in texts.items()}
+    resume_fps = list_resumes(resume_folder)
+
+    stale_postings = posting_store.stale(posting_fps)
+    stale_resumes = resume_store.stale(resume_fps)
+    removed_postings = posting_store.removed(posting_fps)
+    removed_resumes = resume_store.removed(resume_fps)
+
+    if stale_postings:
+        vectors = embeddings.embed_documents([texts[i] for i in stale_postings])
+        posting_store.update(stale_postings, posting_fps, vectors)
+    if stale_resumes:
+        documents = [resume_text(os.path.join(resume_folder, i)) for i in stale_resumes]
+        resume_store.update(stale_resumes, resume_fps, embeddings.embed_documents(documents))
+    posting_store.remove(removed_postings)
+    resume_store.remove(removed_resumes)
+
+    posting_ids = list(posting_fps)
+    resume_ids = sorted(resume_fps)
+    shortlists = {i: s for i, s in load_shortlists(cache_dir).items() if i in posting_fps}
+
+    # A removed or re-uploaded resume already in a shortlist invalidates the stored ranks
+    shortlisted = {resume_id for entries in shortlists.values() for resume_id, _ in entries}
+    full_rebuild = bool(removed_resumes) or any(i in shortlisted for i in stale_resumes)
+    rebuild_ids = posting_ids if full_rebuild else [i for i in posting_ids if i in stale_postings or i not in shortlists]
+    merge_ids = [] if full_rebuild else [i for i in posting_ids if i not in rebuild_ids]
+
+    if rebuild_ids and resume_ids:
+        scores = posting_store.matrix(rebuild_ids) @ resume_store.matrix(resume_ids).T
+        for row, (posting_id, best) in enumerate(zip(rebuild_ids, top_k(scores, k))):
+            shortlists[posting_id] = [[resume_ids[j], float(scores[row, j])] for j in best]
+    elif rebuild_ids:
+        # No resumes left, so no posting has candidates
+        for posting_id in rebuild_ids:
+            shortlists[posting_id] = []
+
+    # Otherwise only the new resumes are scored and merged into the existing lists
+    if merge_ids and stale_resumes:
+        new_scores = posting_store.matrix(merge_ids) @ resume_store.matrix(stale_resumes).T
+        for row, posting_id in enumerate(merge_ids):
+            merged = dict(shortlists[posting_id])
+            merged.update({resume_id: float(score) for resume_id, score in zip(stale_resumes, new_scores[row])})
+            shortlists[posting_id] = [list(item) for item in sorted(merged.items(), key=lambda x: -x[1])[:k]]
+
+    posting_store.save()
+    resume_store.save()
+    save_shortlists(shortlists, cache_dir)
+
+    stats = {
+        "embedded postings": len(stale_postings),
+        "embedded resumes": len(stale_resumes),
+        "rebuilt shortlists": len(rebuild_ids),
+        "merged shortlists": len(merge_ids) if stale_resumes else 0,
+    }
+    return shortlists, stats
@@ -0,0 +1,89 @@
+import re
+
+# Rough token estimate for budgeting prompt text (about 4 characters per token)
+CHARS_PER_TOKEN = 4
+HISTORY_TOKEN_BUDGET = 800
+MEMORY_MAX_CHUNKS = 12
+
+# A follow-up opens with a connective or refers to the earlier candidates explicitly;
+# plain pronouns ("their skills", "these resumes") also appear in fresh questions
+FOLLOW_UP_PATTERN = re.compile(
+    r"^\s*(and|also|what about|how about|and what about)\b"
+    r"|\b(of|among|between|from) (them|those|these)\b"
+    r"|\b(those|the same|the previous|the above) (candidates|applicants|people)\b"
+    r"|\bwhich one\b",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_follow_up(question):
+    return bool(FOLLOW_UP_PATTERN.search(question))
+
+
+def compress_history(messages, token_budget=HISTORY_TOKEN_BUDGET, max_message_tokens=200):
+    """Render recent chat turns as text within a token budget.
+
+    Walks back from the newest message, truncating each one to
+    ``max_message_tokens`` and stopping once the budget is spent, so the
+    prompt size stays flat however long the conversation gets.
+    """
+    lines = []
+    used = 0
+    for message in reversed(messages):
+        content = message["content"]
+        if estimate_tokens(content) > max_message_tokens:
+            content = content[:max_message_tokens * CHARS_PER_TOKEN].rstrip() + " ..."
+        line = f"{message['role']}: {content}"
+        cost = estimate_tokens(line)
+        if used + cost > token_budget:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(reversed(lines))
+
+
+class RetrievalMemory:
+    """Candidates and chunks retrieved in earlier turns of one chat session.
+
+    ``scope`` identifies the resume collection the memory belongs to (the
+    selected job role); switching scope forgets everything.
+    """
+
+    def __init__(self, scope=None, max_chunks=MEMORY_MAX_CHUNKS):
+        self.scope = scope
+        self.max_chunks = max_chunks
+        self.chunks = []
+
+    def reset(self, scope):
+        self.scope = scope
+        self.chunks = []
+
+    @property
+    def sources(self):
+        # Candidates behind the kept chunks, so the filter shrinks as old chunks drop out
+        sources = []
+        for chunk in self.chunks:
+            source = chunk.metadata.get("source")
+            if source and source not in sources:
+                sources.append(source)
+        return sources
+
+    def __bool__(self):
+        return bool(self.sources)
+
+    def remember(self, documents):
+        """Keep the newest unique chunks and the candidates they came from."""
+        seen = {chunk.page_content for chunk in documents}
+        kept = [chunk for chunk in self.chunks if chunk.page_content not in seen]
+        self.chunks = (kept + list(documents))[-self.max_chunks:]
+
+    def search_filter(self):
+        # Chroma metadata filter restricting retrieval to remembered candidates
+        sources = self.sources
+        if len(sources) == 1:
+            return {"source": sources[0]}
+        return {"source": {"$in": sources}}
@@ -0,0 +1,54 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class FigureCache:
+    """Bounded LRU cache for built figures with per-figure build timings.
+
+    Keys are tuples such as ``(figure_name, data_version, selected_roles)``; the
+    first element names the figure in the timing statistics.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def _record(self, name, hit, seconds=0.0):
+        stat = self.stats.setdefault(name, {"hits": 0, "misses": 0, "last build (ms)": 0.0, "total build (ms)": 0.0})
+        if hit:
+            stat["hits"] += 1
+        else:
+            stat["misses"] += 1
+            stat["last build (ms)"] = seconds * 1000
+            stat["total build (ms)"] += seconds * 1000
+
+    def get_or_build(self, key, builder):
+        name = key[0]
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._record(name, hit=True)
+                return self._entries[key]
+
+        # Build outside the lock so one slow figure does not block other sessions
+        start = time.perf_counter()
+        value = builder()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._record(name, hit=False, seconds=elapsed)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,239 @@
+"""Bulk, offline indexing of resume PDFs into the AI page's quantized index.
+
+Each job-role folder under the resume root (``uploaded_resumes/<job role>/``)
+becomes ``<index dir>/<job role>``, the same index the AI page opens when it
+runs with VECTOR_BACKEND=quantized. The page sees the index as current because
+it stores the same folder fingerprint.
+
+    python ingest_resumes.py                              # every role folder
+    python ingest_resumes.py --roles "Data Science" --workers 8 --embed-workers 4
+    python ingest_resumes.py --dry-run
+
+Parsed chunks and embeddings are checkpointed per PDF, so an interrupted run
+continues where it stopped when started again.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+from candidate_matching import EMBEDDING_MODEL
+from quantized_store import INDEX_DTYPES, QuantizedIndex, index_is_current
+from resume_files import RESUME_FOLDER, folder_fingerprint, list_resumes
+
+DEFAULT_INDEX_DIR = ".vector_index"
+CHECKPOINT_DIR = ".checkpoints"
+
+# Same splitting as the AI page
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+
+def parse_pdf(pdf_path):
+    """Load and split one PDF; runs in a worker process. Returns [(text, metadata), ...]."""
+    from langchain_community.document_loaders import UnstructuredPDFLoader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    documents = UnstructuredPDFLoader(file_path=pdf_path).load()
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    return [(chunk.page_content, chunk.metadata) for chunk in splitter.split_documents(documents)]
+
+
+class Checkpoint:
+    """Per-PDF parsed chunks and embeddings for one role, stored as .npz files."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, pdf_path):
+        return os.path.join(self.path, hashlib.sha1(pdf_path.encode("utf-8")).hexdigest() + ".npz")
+
+    def load(self, pdf_path, fingerprint):
+        path = self._file(pdf_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data["fingerprint"]) != fingerprint:
+                    return None
+                return json.loads(str(data["chunks"])), data["vectors"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, pdf_path, fingerprint, chunks, vectors):
+        path = self._file(pdf_path)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, fingerprint=np.array(fingerprint), chunks=np.array(json.dumps(chunks)),
+                 vectors=np.asarray(vectors, dtype=np.float32))
+        os.replace(tmp_path, path)
+
+    def remove(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def role_folders(root, roles=None):
+    folders = sorted(d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)))
+    return [d for d in folders if roles is None or d in roles]
+
+
+def ingest_role(role, args, embeddings, report):
+    folder = os.path.join(args.root, role)
+    index_path = os.path.join(args.index_dir, role)
+    fingerprint = folder_fingerprint(folder)
+    files = {os.path.join(folder, rel): fp for rel, fp in sorted(list_resumes(folder).items())}
+
+    if not files:
+        print(f"[{role}] no PDFs, skipped")
+        return
+    if index_is_current(index_path, fingerprint) and not args.force:
+        print(f"[{role}] index is current ({len(files)} PDFs), skipped")
+        report["skipped roles"] += 1
+        return
+    if args.dry_run:
+        size = sum(os.path.getsize(path) for path in files) / 1e6
+        print(f"[{role}] would index {len(files)} PDFs ({size:.1f} MB) into {index_path}")
+        report["files"] += len(files)
+        return
+
+    checkpoint = Checkpoint(os.path.join(args.index_dir, CHECKPOINT_DIR, role))
+    results = {}
+    pending = []
+    for path, fp in files.items():
+        saved = checkpoint.load(path, fp)
+        if saved is None:
+            pending.append(path)
+        else:
+            results[path] = saved
+    if results:
+        print(f"[{role}] resuming: {len(results)} of {len(files)} PDFs already done")
+        report["resumed"] += len(results)
+
+    def embed_and_checkpoint(path, chunks):
+        texts = [text for text, _ in chunks]
+        if not texts:
+            # No extractable text (e.g. an image-only scan): done, with nothing to embed
+            checkpoint.save(path, files[path], chunks, np.zeros((0, 0), dtype=np.float32))
+            return chunks, np.zeros((0, 0), dtype=np.float32)
+        vectors = [
+            vector
+            for start in range(0, len(texts), args.batch_size)
+            for vector in embeddings.embed_documents(texts[start:start + args.batch_size])
+        ]
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+        checkpoint.save(path, files[path], chunks, vectors)
+        return chunks, vectors
+
+    # Parsing runs in processes (CPU bound); embedding requests overlap in threads as soon as
+    # each PDF is parsed, and every finished PDF is checkpointed immediately
+    parsers = ProcessPoolExecutor(max_workers=args.workers)
+    embedders = ThreadPoolExecutor(max_workers=args.embed_workers)
+    try:
+        parse_futures = {parsers.submit(parse_pdf, path): path for path in pending}
+        embed_futures = {}
+        for future in as_completed(parse_futures):
+            path = parse_futures[future]
+            try:
+                embed_futures[embedders.submit(embed_and_checkpoint, path, future.result())] = path
+            except Exception as e:
+                report["failures"].append((path, f"parse: {type(e).__name__}: {e}"))
+                print(f"[{role}] FAILED {path}: {e}", file=sys.stderr)
+        for done, future in enumerate(as_completed(embed_futures), 1):
+            path = embed_futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                report["failures"].append((path, f"embed: {type(e).__name__}: {e}"))
+                print(f"[{role}] FAILED {path}: {e}", file=sys.stderr)
+                continue
+            report["files"] += 1
+            report["new chunks"] += len(results[path][0])
+            print(f"[{role}] {done}/{len(embed_futures)} {os.path.basename(path)}: {len(results[path][0])} chunks")
+    except KeyboardInterrupt:
+        # Drop the queued PDFs instead of waiting for them; finished ones are checkpointed
+        for pool in (parsers, embedders):
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    parsers.shutdown()
+    embedders.shutdown()
+
+    texts, metadatas, vectors = [], [], []
+    for path in files:
+        if path not in results:
+            continue
+        chunks, file_vectors = results[path]
+        if not chunks:
+            report["empty"].append(path)
+            continue
+        for (text, metadata), vector in zip(chunks, file_vectors):
+            texts.append(text)
+            metadatas.append(metadata)
+            vectors.append(vector)
+    report["chunks"] += len(texts)
+
+    failed = [path for path in files if path not in results]
+    if not texts:
+        print(f"[{role}] nothing indexed")
+        return
+    # An index missing failed files must not look current, so the page or a rerun retries them
+    index_fingerprint = fingerprint if not failed else f"partial:{fingerprint}"
+    QuantizedIndex.build(index_path, np.stack(vectors), texts, metadatas, dtype=args.dtype,
+                         model=EMBEDDING_MODEL, extra_meta={"fingerprint": index_fingerprint})
+    if not failed:
+        checkpoint.remove()
+    print(f"[{role}] index written: {len(texts)} chunks from {len(results)} PDFs -> {index_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index resume PDFs into the AI page's quantized vector index.")
+    parser.add_argument("--root", default=RESUME_FOLDER, help="folder with one sub-folder per job role")
+    parser.add_argument("--index-dir", default=os.environ.get("VECTOR_INDEX_DIR", DEFAULT_INDEX_DIR))
+    parser.add_argument("--roles", nargs="+", help="only these job-role folders")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="PDF parsing processes")
+    parser.add_argument("--embed-workers", type=int, default=2, help="concurrent embedding requests")
+    parser.add_argument("--batch-size", type=int, default=32, help="chunks per embedding request")
+    parser.add_argument("--dtype", choices=INDEX_DTYPES, default="int8")
+    parser.add_argument("--force", action="store_true", help="rebuild indexes that are already current")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be indexed")
+    args = parser.parse_args()
+
+    embeddings = None
+    if not args.dry_run:
+        from langchain_ollama import OllamaEmbeddings
+        embeddings = OllamaEmbeddings(model=EMBEDDING_MODEL)
+
+    report = {"files": 0, "resumed": 0, "chunks": 0, "new chunks": 0, "skipped roles": 0, "empty": [], "failures": []}
+    start = time.perf_counter()
+    try:
+        for role in role_folders(args.root, args.roles):
+            ingest_role(role, args, embeddings, report)
+    except KeyboardInterrupt:
+        print("\nInterrupted; finished PDFs are checkpointed, run the same command again to resume.")
+    elapsed = time.perf_counter() - start
+
+    print("\n=== Ingestion report ===")
+    print(f"files:       {report['files']}" + (" (dry run)" if args.dry_run else ""))
+    print(f"resumed:     {report['resumed']} (from checkpoints)")
+    print(f"chunks:      {report['chunks']}")
+    print(f"up to date:  {report['skipped roles']} roles")
+    print(f"no text:     {len(report['empty'])}")
+    for path in report["empty"]:
+        print(f"  - {path}")
+    print(f"failures:    {len(report['failures'])}")
+    for path, reason in report["failures"]:
+        print(f"  - {path}: {reason}")
+    print(f"elapsed:     {elapsed:.1f}s")
+    if elapsed > 0 and not args.dry_run:
+        # Only work done in this run; files resumed from checkpoints are excluded
+        print(f"throughput:  {report['files'] / elapsed:.2f} files/s, {report['new chunks'] / elapsed:.1f} chunks/s")
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from applicant_filters import indicator_column
+
+# Default store for job postings, kept next to JobsApp.py
+POSTINGS_PATH = "job_postings.json"
+
+JOB_LEVELS = ["Junior", "Mid", "Senior", "Manager"]
+
+# "30,000 - 50,000", "2 - 3" or a single number such as 6
+RANGE_PATTERN = r"^\s*(?P<low>\d[\d,]*(?:\.\d+)?)\s*(?:-\s*(?P<high>\d[\d,]*(?:\.\d+)?))?\s*$"
+
+
+def load_postings(path=POSTINGS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return pd.DataFrame(json.load(f))
+
+
+def parse_range(values):
+    """Parse a column of range strings into numeric (low, high) Series.
+
+    Values that are not a number or a "low - high" range (e.g. "Negotiable") become NaN.
+    """
+    parts = values.astype(str).str.extract(RANGE_PATTERN)
+    low = pd.to_numeric(parts["low"].str.replace(",", "", regex=False), errors="coerce")
+    high = pd.to_numeric(parts["high"].str.replace(",", "", regex=False), errors="coerce")
+    return low, high.fillna(low)
+
+
+def normalize_postings(raw):
+    """Add numeric salary/experience ranges and categorical level/location columns."""
+    df = raw.reset_index(drop=True).copy()
+    df["Salary Min"], df["Salary Max"] = parse_range(df["Salary Range (THB)"])
+    df["Experience Min"], df["Experience Max"] = parse_range(df["Experience Needed (Years)"])
+    df["Negotiable"] = df["Salary Min"].isna()
+    levels = JOB_LEVELS + sorted(set(df["Job Level"]) - set(JOB_LEVELS))
+    df["Job Level"] = pd.Categorical(df["Job Level"], categories=levels)
+    df["Location"] = df["Location"].astype("category")
+    return df
+
+
+class PostingIndex:
+    """Lookup structures over normalized postings for fast filtered search.
+
+    Level and location map to arrays of row positions; salary is searched with
+    a binary search over postings sorted by their upper salary bound.
+    """
+
+    def __init__(self, postings):
+        self.postings = postings
+        self.by_level = {k: np.asarray(v) for k, v in postings.groupby("Job Level", observed=True).indices.items()}
+        self.by_location = {k: np.asarray(v) for k, v in postings.groupby("Location", observed=True).indices.items()}
+        salaried = np.flatnonzero(~postings["Negotiable"].to_numpy())
+        order = np.argsort(postings["Salary Max"].to_numpy()[salaried], kind="stable")
+        self.salary_positions = salaried[order]
+        self.salary_max_sorted = postings["Salary Max"].to_numpy()[self.salary_positions]
+        self.negotiable_positions = np.flatnonzero(postings["Negotiable"].to_numpy())
+        self.search_text = postings["Position"].astype(str).str.lower()
+
+    def _mask_from(self, index, keys):
+        mask = np.zeros(len(self.postings), dtype=bool)
+        for key in keys:
+            mask[index.get(key, [])] = True
+        return mask
+
+    def search(self, levels=None, locations=None, min_salary=None, include_negotiable=True, text=None):
+        """Return the row positions of postings matching every given filter."""
+        mask = np.ones(len(self.postings), dtype=bool)
+        if levels:
+            mask &= self._mask_from(self.by_level, levels)
+        if locations:
+            mask &= self._mask_from(self.by_location, locations)
+        if min_salary:
+            # Postings whose upper bound reaches the requested salary
+            start = np.searchsorted(self.salary_max_sorted, min_salary, side="left")
+            salary_mask = np.zeros(len(self.postings), dtype=bool)
+            salary_mask[self.salary_positions[start:]] = True
+            if include_negotiable:
+                salary_mask[self.negotiable_positions] = True
+            mask &= salary_mask
+        elif not include_negotiable:
+            mask[self.negotiable_positions] = False
+        if text:
+            mask &= self.search_text.str.contains(text.lower(), regex=False).to_numpy()
+        return np.flatnonzero(mask)
+
+
+def count_matching_applicants(postings, applicants, chunk_size=1024):
+    """Count applicants matching each posting on location, experience and salary.
+
+    ``applicants`` must carry the Preferred Location indicator columns from
+    applicant_filters.add_indicator_columns. An applicant matches when the
+    posting's location is among their preferred locations, their experience
+    reaches the posting minimum and, unless the salary is negotiable, their
+    expected salary is within the posting's upper bound.
+    """
+    counts = np.zeros(len(postings), dtype=np.int64)
+    if applicants is None or applicants.empty or postings.empty:
+        return counts
+
+    experience = pd.to_numeric(applicants["Years of Experience"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    salary = pd.to_numeric(applicants["Expected Salary"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+    # Applicant x location matrix, one column per distinct posting location
+    locations = list(postings["Location"].cat.categories)
+    location_matrix = np.column_stack([
+        applicants[indicator_column("Preferred Location", loc)].to_numpy(dtype=bool)
+        if indicator_column("Preferred Location", loc) in applicants.columns
+        else np.zeros(len(applicants), dtype=bool)
+        for loc in locations
+    ])
+    location_codes = postings["Location"].cat.codes.to_numpy()
+
+    exp_min = postings["Experience Min"].fillna(0).to_numpy(dtype=float)
+    salary_max = postings["Salary Max"].fillna(np.inf).to_numpy(dtype=float)
+
+    # Postings x applicants comparisons, chunked over postings to bound memory
+    for start in range(0, len(postings), chunk_size):
+        stop = start + chunk_size
+        codes = location_codes[start:stop]
+        in_location = np.where(codes[:, None] >= 0, location_matrix[:, np.maximum(codes, 0)].T, False)
+        has_experience = experience[None, :] >= exp_min[start:stop, None]
+        within_salary = salary[None, :] <= salary_max[start:stop, None]
+        counts[start:stop] = (in_location & has_experience & within_salary).sum(axis=1)
+    return counts
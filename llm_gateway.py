@@ -0,0 +1,279 @@
+"""Local inference gateway in front of Ollama.
+
+Run it as a separate process and point the AI page at it:
+
+    python llm_gateway.py --port 11435 --upstream http://localhost:11434 --concurrency 2
+    LLM_GATEWAY_URL=http://localhost:11435 streamlit run JobsApp.py
+
+The gateway speaks the Ollama HTTP API, so ChatOllama only needs a different
+``base_url``. POST requests to /api/* wait for one of ``--concurrency`` slots;
+slots are granted round-robin across sessions (the X-Session-ID header), so one
+recruiter's burst of questions cannot starve the others. Queue state is served
+under /gateway/sessions/<session_id>, and DELETE on that path cancels the
+session's requests.
+
+``python llm_gateway.py --stub`` starts the gateway in front of a stub model
+server that answers every chat request with a canned reply after a delay.
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SESSION_HEADER = "X-Session-ID"
+DEFAULT_UPSTREAM = "http://localhost:11434"
+DEFAULT_PORT = 11435
+
+
+class RequestCancelled(Exception):
+    pass
+
+
+class FairScheduler:
+    """Concurrency-limited slots granted round-robin across sessions."""
+
+    def __init__(self, concurrency=1):
+        self.concurrency = concurrency
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # session_id -> deque of queued ticket ids
+        self._tickets = {}  # ticket id -> {"session": ..., "state": queued|running|cancelled}
+        self._running = 0
+        self._ids = itertools.count(1)
+
+    def submit(self, session_id):
+        with self._cond:
+            ticket = next(self._ids)
+            self._tickets[ticket] = {"session": session_id, "state": "queued"}
+            self._queues.setdefault(session_id, deque()).append(ticket)
+            self._grant()
+            return ticket
+
+    def _grant(self):
+        # Take the head of the first waiting session, then move that session to the back
+        while self._running < self.concurrency and self._queues:
+            session_id, queue = next(iter(self._queues.items()))
+            ticket = queue.popleft()
+            del self._queues[session_id]
+            if queue:
+                self._queues[session_id] = queue
+            self._tickets[ticket]["state"] = "running"
+            self._running += 1
+        self._cond.notify_all()
+
+    def acquire(self, ticket):
+        """Block until the ticket holds a slot; raise RequestCancelled if it was cancelled."""
+        with self._cond:
+            while self._tickets[ticket]["state"] == "queued":
+                self._cond.wait()
+            if self._tickets[ticket]["state"] == "cancelled":
+                del self._tickets[ticket]
+                raise RequestCancelled(ticket)
+
+    def release(self, ticket):
+        with self._cond:
+            info = self._tickets.pop(ticket, None)
+            if info is not None and info["state"] in ("running", "cancelled-running"):
+                self._running -= 1
+            self._grant()
+
+    def is_cancelled(self, ticket):
+        with self._cond:
+            return self._tickets.get(ticket, {}).get("state", "").startswith("cancelled")
+
+    def cancel_session(self, session_id):
+        """Cancel every queued and running request of a session; return how many."""
+        with self._cond:
+            cancelled = 0
+            for ticket in self._queues.pop(session_id, ()):
+                self._tickets[ticket]["state"] = "cancelled"
+                cancelled += 1
+            for info in self._tickets.values():
+                if info["session"] == session_id and info["state"] == "running":
+                    info["state"] = "cancelled-running"
+                    cancelled += 1
+            self._cond.notify_all()
+            return cancelled
+
+    def dispatch_order(self):
+        """Queued tickets in the order they will be granted."""
+        with self._cond:
+            queues = [list(queue) for queue in self._queues.values()]
+        order = []
+        for round_tickets in itertools.zip_longest(*queues):
+            order.extend(t for t in round_tickets if t is not None)
+        return order
+
+    def session_status(self, session_id):
+        order = self.dispatch_order()
+        with self._cond:
+            mine = [t for t, info in self._tickets.items() if info["session"] == session_id]
+            return {
+                "session_id": session_id,
+                "queued_positions": [position for position, t in enumerate(order, 1) if t in mine],
+                "running": sum(self._tickets[t]["state"] == "running" for t in mine),
+                "queue_length": len(order),
+                "concurrency": self.concurrency,
+                "busy_slots": self._running,
+            }
+
+
+def make_gateway_handler(scheduler, upstream):
+    class GatewayHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _session_from_path(self):
+            prefix = "/gateway/sessions/"
+            return self.path[len(prefix):] if self.path.startswith(prefix) else None
+
+        def _proxy(self, body=None, ticket=None):
+            request = urllib.request.Request(
+                upstream + self.path, data=body, method=self.command,
+                headers={"Content-Type": self.headers.get("Content-Type", "application/json")},
+            )
+            try:
+                with urllib.request.urlopen(request) as response:
+                    self.send_response(response.status)
+                    self.send_header("Content-Type", response.headers.get("Content-Type", "application/json"))
+                    self.end_headers()
+                    # Stream NDJSON chunks through; closing upstream stops generation on cancel
+                    while chunk := response.read1(65536):
+                        if ticket is not None and scheduler.is_cancelled(ticket):
+                            break
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+            except urllib.error.HTTPError as e:
+                self.send_response(e.code)
+                self.end_headers()
+                self.wfile.write(e.read())
+
+        def do_GET(self):
+            session_id = self._session_from_path()
+            if session_id is not None:
+                self._send_json(200, scheduler.session_status(session_id))
+            else:
+                self._proxy()
+
+        def do_DELETE(self):
+            session_id = self._session_from_path()
+            if session_id is None:
+                self._proxy()
+                return
+            self._send_json(200, {"cancelled": scheduler.cancel_session(session_id)})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+            if not self.path.startswith("/api/"):
+                self._proxy(body)
+                return
+            session_id = self.headers.get(SESSION_HEADER) or self.client_address[0]
+            ticket = scheduler.submit(session_id)
+            try:
+                scheduler.acquire(ticket)
+            except RequestCancelled:
+                self._send_json(499, {"error": "request cancelled"})
+                return
+            try:
+                self._proxy(body, ticket)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                scheduler.release(ticket)
+
+    return GatewayHandler
+
+
+def make_stub_handler(reply="This is a stub reply.", delay=1.0):
+    """Minimal Ollama-compatible model server for exercising the gateway."""
+
+    class StubModelHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0) or 0)) or b"{}")
+            time.sleep(delay)
+            message = {"role": "assistant", "content": reply}
+            lines = []
+            if request.get("stream", True):
+                lines.append({"model": request.get("model"), "message": message, "done": False})
+                lines.append({"model": request.get("model"), "message": {"role": "assistant", "content": ""},
+                              "done": True, "done_reason": "stop"})
+            else:
+                lines.append({"model": request.get("model"), "message": message, "done": True, "done_reason": "stop"})
+            body = "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return StubModelHandler
+
+
+def serve_in_thread(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+class GatewayClient:
+    """Queue status and cancellation calls used by the Streamlit pages."""
+
+    def __init__(self, base_url, timeout=2):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, method, session_id):
+        request = urllib.request.Request(f"{self.base_url}/gateway/sessions/{session_id}", method=method)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.load(response)
+
+    def session_status(self, session_id):
+        return self._call("GET", session_id)
+
+    def cancel_session(self, session_id):
+        return self._call("DELETE", session_id)["cancelled"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Queueing gateway in front of a local Ollama server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM, help="Ollama base URL")
+    parser.add_argument("--concurrency", type=int, default=1, help="requests sent to the model at once")
+    parser.add_argument("--stub", action="store_true", help="serve a stub model instead of Ollama")
+    parser.add_argument("--stub-delay", type=float, default=1.0, help="seconds per stub reply")
+    args = parser.parse_args()
+
+    upstream = args.upstream
+    if args.stub:
+        stub = ThreadingHTTPServer((args.host, 0), make_stub_handler(delay=args.stub_delay))
+        serve_in_thread(stub)
+        upstream = f"http://{args.host}:{stub.server_address[1]}"
+        print(f"Stub model server on {upstream}")
+
+    scheduler = FairScheduler(args.concurrency)
+    server = ThreadingHTTPServer((args.host, args.port), make_gateway_handler(scheduler, upstream.rstrip("/")))
+    print(f"LLM gateway on http://{args.host}:{args.port} -> {upstream} (concurrency {args.concurrency})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import datetime
 import os
 import gspread
 from google.oauth2.service_account import Credentials
+from applicant_schema import EDUCATION_LEVELS, JOB_ROLES, SHEET_COLUMNS, to_sheet_row
 
 # Define the scope for Google Sheets API
 scope = [
@@ -32,11 +33,7 @@ sheet = spreadsheet.sheet1
 def initialize_state():
     if 'submissions' not in st.session_state:
         try:
-            st.session_state.submissions = pd.DataFrame(columns=[ 
-                "Languages", "Gender", "First Name", "Last Name", "Birth Date", "Email", "Phone", 
-                "Desired Job Role", "Work Environment", "Job Type", "Preferred Location", "Near BTS/MRT Line", 
-                "Expected Salary", "Years of Experience", "Highest Level of Education", "Skills", "Resume File Name"
-            ])
+            st.session_state.submissions = pd.DataFrame(columns=SHEET_COLUMNS)
         except Exception as e:
             st.error(f"Error initializing session state: {e}")
 
@@ -80,14 +77,7 @@ def display_form():
         st.markdown("### 💼 **Job Preferences**")
         
         # Desired Job Role on the first column
-        job_roles = [
-            "",  # Blank option
-            "Software Development", "Data Science", "Product Management", "Design", 
-            "Marketing", "Sales", "Human Resources", "Customer Support", 
-            "Finance", "Project Management", "Content Creation", "UI/UX Design", 
-            "Business Analysis", "Engineering", "Cybersecurity", "Operations", 
-            "Production", "Other"
-        ]
+        job_roles = [""] + JOB_ROLES  # Blank option first
         job_role = st.selectbox("Desired Job Role*", job_roles, key="job_role")
         
         # Work Environment (checkboxes)
@@ -108,7 +98,7 @@ def display_form():
         with col1:
             years_of_experience = st.number_input("Years of Experience*", min_value=0, max_value=50, step=1, key="experience")
         with col2:
-            education = st.selectbox("Highest Level of Education*", ["", "High School", "Associate Degree", "Bachelor's Degree", "Master's Degree", "PhD"], key="education")
+            education = st.selectbox("Highest Level of Education*", [""] + EDUCATION_LEVELS, key="education")
         
         # Preferred Location (checkboxes in 5 rows, 2 columns)
         st.divider()
@@ -177,25 +167,26 @@ def save_submission_to_sheet(languages, gender, first_name, last_name, birth_dat
         # Add quotes around the phone number to ensure it's treated as a string in Google Sheets
         phone = f'{phone}'
 
-        new_data = [
-            ", ".join(languages),  # Save the selected languages as a comma-separated string
-            gender,
-            first_name,
-            last_name,
-            str(birth_date),
-            email,
-            phone,  # Phone number is now a string with quotes
-            job_role,
-            ", ".join(work_environment),  # Save as comma-separated string
-            ", ".join(job_type),  # Save as comma-separated string
-            ", ".join(preferred_location),  # Save selected locations as comma-separated string
-            near_bts_mrt, 
-            salary,
-            experience,
-            education,
-            skills,
-            resume_file
-        ]
+        # Build the row from the shared schema so the column order cannot drift
+        new_data = to_sheet_row({
+            "Languages": languages,  # Saved as a comma-separated string
+            "Gender": gender,
+            "First Name": first_name,
+            "Last Name": last_name,
+            "Birth Date": str(birth_date),
+            "Email": email,
+            "Phone": phone,
+            "Desired Job Role": job_role,
+            "Work Environment": work_environment,
+            "Job Type": job_type,
+            "Preferred Location": preferred_location,
+            "Near BTS/MRT Line": near_bts_mrt,
+            "Expected Salary": salary,
+            "Years of Experience": experience,
+            "Highest Level of Education": education,
+            "Skills": skills,
+            "Resume File Name": resume_file,
+        })
         sheet.append_row(new_data)
     except Exception as e:
         st.error(f"Error saving submission to Google Sheets: {e}")
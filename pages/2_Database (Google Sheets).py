@@ -1,6 +1,8 @@
 import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
+from applicant_export import render_export_controls
+from applicant_schema import LIST_COLUMNS, data_version, join_list_columns, parse_applicants
 
 ####################################################START GETTING DATABASE FOR ANALYSIS########################################################
 # Create a connection object
@@ -9,32 +11,38 @@ conn = st.connection("gsheets", type=GSheetsConnection)
 # Function to read data from Google Sheets and cache it
 @st.cache_data
 def load_data():
-    df = conn.read()
-    
-    df.columns = [
-        "Languages", "Gender", "First Name", "Last Name", "Birth Date", "Email", "Phone", 
-        "Desired Job Role", "Work Environment", "Job Type", "Preferred Location", "Near BTS/MRT Line", 
-        "Expected Salary", "Years of Experience", "Highest Level of Education", "Skills", "Resume File Name"
-    ]
-    
-    # Convert Birth Date to datetime
-    df["Birth Date"] = pd.to_datetime(df["Birth Date"], errors="coerce")
-    
-    # Ensure the Phone column is treated as a string (to preserve leading zeros)
-    df["Phone"] = df["Phone"].astype(str)
-    
-    # Rename the 'Phone' column to 'Phone (+66)'
-    df.rename(columns={"Phone": "Phone (+66)"}, inplace=True)
-    
-    # Reorder columns as requested
-    df = df[[ 
-        "First Name", "Last Name", "Gender", "Birth Date", "Email", "Phone (+66)", 
-        "Highest Level of Education", "Languages", "Years of Experience", "Skills", 
-        "Desired Job Role", "Expected Salary", "Work Environment", "Job Type", 
-        "Preferred Location", "Near BTS/MRT Line", "Resume File Name"
-    ]]
-    
-    return df
+    # Columns are matched by header name and typed once by the shared schema
+    return parse_applicants(conn.read())
+
+# Fingerprint of the loaded sheet, recomputed only when the data cache is cleared
+@st.cache_data
+def load_data_version():
+    return data_version(load_data())
+
+# Lower-cased text of every row, built once per data load so search is a single vectorized lookup
+@st.cache_data
+def build_search_index(df):
+    return join_list_columns(df).astype(str).agg(" ".join, axis=1).str.lower()
+
+# Keep only the rows whose text contains the search term
+def search_rows(df, search_index, search_text):
+    if not search_text:
+        return df
+    matches = search_index.loc[df.index].str.contains(search_text.lower(), regex=False).to_numpy()
+    return df[matches]
+
+# Sort the matching rows
+def sort_rows(df, sort_column, ascending):
+    if not sort_column:
+        return df
+    # List columns sort by their comma-joined text
+    key = (lambda values: values.str.join(", ")) if sort_column in LIST_COLUMNS else None
+    return df.sort_values(by=sort_column, ascending=ascending, na_position="last", kind="stable", key=key)
+
+# Slice out only the requested page
+def page_slice(df, page, page_size):
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
 
 ##################################################END OF GETTING DATABASE FOR ANALYSIS######################################################
 
@@ -50,27 +58,57 @@ st.markdown("[📄 Open Google Sheets](https://docs.google.com/spreadsheets/d/1P
 # Add a button to refresh data
 if st.button("🔄 Refresh Data"):
     st.cache_data.clear()  # Clear the cached data
+    st.session_state.pop("database_export", None)  # Drop an export prepared from the old data
     st.rerun()  # Rerun the app to reload data
 
 # Load data from Google Sheets
 df = load_data()
 ####################################################END OF REFRESH DATABASE########################################################
 
-# Add a download button for the data
-csv_data = df.to_csv(index=False).encode('utf-8')  # `index=False` removes the index from the CSV
-st.download_button(
-    label="⬇️ Download Data as CSV",
-    data=csv_data,
-    file_name="google_sheets_data.csv",
-    mime="text/csv"
-)
-
-# Display the DataFrame without index using st.write
+####################################################PAGED DATA TABLE########################################################
 st.markdown("### 📋 Data Table")
-st.write(df.style.format(
-    {
-        "Birth Date": lambda x: x.strftime("%Y-%m-%d") if pd.notnull(x) else "",
-        "Expected Salary": "฿{:,.0f}",
-        "Years of Experience": "{:.0f}",
-    }
+
+search_index = build_search_index(df)
+
+col1, col2, col3 = st.columns([2, 2, 1])
+with col1:
+    search_text = st.text_input("🔎 Search", placeholder="Name, email, skill, role...")
+with col2:
+    sort_column = st.selectbox("Sort by", [""] + list(df.columns))
+with col3:
+    ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+
+visible_columns = st.multiselect("Columns", options=list(df.columns), default=list(df.columns))
+
+col1, col2 = st.columns([1, 3])
+with col1:
+    page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+
+# Search and sort run on the server; only the visible page is formatted and sent to the browser
+matching_df = search_rows(df, search_index, search_text)
+total_rows = len(matching_df)
+total_pages = max(1, -(-total_rows // page_size))
+with col2:
+    page = st.number_input(f"Page (1 - {total_pages})", min_value=1, max_value=total_pages, value=1, step=1)
+
+sorted_df = sort_rows(matching_df, sort_column, ascending)
+page_df = page_slice(sorted_df, page, page_size)
+page_df = page_df[[c for c in df.columns if c in visible_columns]]
+
+st.caption(f"Showing {len(page_df)} of {total_rows} applicants (page {page} of {total_pages})")
+
+# Export the searched and sorted rows (all pages); the file is only built when requested
+with st.expander("⬇️ Export Data"):
+    render_export_controls(sorted_df[page_df.columns], key="database", file_stem="google_sheets_data",
+                           data_version=load_data_version())
+
+# Display the current page without index using st.write
+formats = {
+    "Birth Date": lambda x: x.strftime("%Y-%m-%d") if pd.notnull(x) else "",
+    "Expected Salary": "฿{:,.0f}",
+    "Years of Experience": "{:.0f}",
+}
+st.write(join_list_columns(page_df).style.format(
+    {column: fmt for column, fmt in formats.items() if column in page_df.columns}, na_rep=""
 ).hide(axis="index"), use_container_width=True)
+####################################################END OF PAGED DATA TABLE########################################################
@@ -2,7 +2,17 @@ import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
 import plotly.express as px
-import random
+import numpy as np
+from applicant_export import render_export_controls
+from applicant_schema import data_version, parse_applicants
+from figure_cache import FigureCache
+from applicant_filters import (
+    add_indicator_columns,
+    build_filter_mask,
+    drop_indicator_columns,
+    indicator_column,
+    indicator_options,
+)
 
 ############################################
 # 1) CONNECT TO GOOGLE SHEETS AND LOAD DATA
@@ -11,127 +21,81 @@ conn = st.connection("gsheets", type=GSheetsConnection)
 
 @st.cache_data
 def load_data():
-    df = conn.read()
-    
-    df.columns = [
-        "Languages", "Gender", "First Name", "Last Name", "Birth Date", "Email", "Phone", 
-        "Desired Job Role", "Work Environment", "Job Type", "Preferred Location", "Near BTS/MRT Line", 
-        "Expected Salary", "Years of Experience", "Highest Level of Education", "Skills", "Resume File Name"
-    ]
-    
-    # แปลงคอลัมน์ Languages เป็น string ป้องกัน error split()
-    df["Languages"] = df["Languages"].fillna("").astype(str)
+    # Typed columns from the shared schema (lists, categories, nullable numbers)
+    df = parse_applicants(conn.read())
 
-    # Convert Birth Date to datetime
-    df["Birth Date"] = pd.to_datetime(df["Birth Date"], errors="coerce")
-    
-    # Phone -> Phone (+66)
-    df["Phone"] = df["Phone"].astype(str)
-    df.rename(columns={"Phone": "Phone (+66)"}, inplace=True)
-    
-    # Reorder columns
-    df = df[[ 
-        "First Name", "Last Name", "Gender", "Birth Date", "Email", "Phone (+66)", 
-        "Highest Level of Education", "Languages", "Years of Experience", "Skills", 
-        "Desired Job Role", "Expected Salary", "Work Environment", "Job Type", 
-        "Preferred Location", "Near BTS/MRT Line", "Resume File Name"
-    ]]
+    # Parse the list columns once into indicator columns for filtering
+    df = add_indicator_columns(df)
     return df
 
 ############################################
 # 2) LAT/LONG MAPPING & JITTER
 ############################################
+# Bangkok district centres for every location offered by the application form
 location_coordinates = {
-    "Bangkok": (13.7563, 100.5018),
-    "Chiang Mai": (18.7883, 98.9853),
-    "Khon Kaen": (16.4322, 102.8236),
-    "Phuket": (7.8804, 98.3923),
-    "Chiang Rai": (19.9105, 99.8406),
-    "Chonburi": (13.3611, 100.9847),
-    "Saraburi": (14.5302, 100.9103),
-    "Samutprakan": (13.5991, 100.5967),
-    "Other": (13.7367, 100.5231),  # Default to Bangkok
+    "Bang Kapi": (13.7656, 100.6474),
+    "Bang Rak": (13.7300, 100.5240),
+    "Chatuchak": (13.8285, 100.5599),
+    "Huai Khwang": (13.7767, 100.5795),
+    "Khlong Toei": (13.7081, 100.5837),
+    "Phra Nakhon": (13.7563, 100.4996),
+    "Ratchathewi": (13.7587, 100.5345),
+    "Sathon": (13.7081, 100.5265),
+    "Watthana": (13.7420, 100.5852),
+    "Others": (13.7563, 100.5018),  # Default to central Bangkok
 }
-
-def add_coordinates_with_jitter(data):
-    def jitter(value, delta=0.01):
-        return value + random.uniform(-delta, delta)
-
-    data["Latitude"] = data["Preferred Location"].map(
-        lambda loc: jitter(location_coordinates.get(loc, (13.7367, 100.5231))[0])
-    )
-    data["Longitude"] = data["Preferred Location"].map(
-        lambda loc: jitter(location_coordinates.get(loc, (13.7367, 100.5231))[1])
-    )
-    return data
+DEFAULT_COORDINATES = location_coordinates["Others"]
+
+# Above this many points the map shows one bubble per district instead of one marker per applicant
+MAP_MARKER_LIMIT = 2000
+
+def add_coordinates_with_jitter(data, delta=0.005, seed=42):
+    # One point per (applicant, preferred location); applicants may choose several districts
+    locations = indicator_options(data, "Preferred Location")
+    flags = data[[indicator_column("Preferred Location", loc) for loc in locations]].to_numpy(dtype=bool)
+    row_idx, loc_idx = np.nonzero(flags)
+
+    # Applicants without a preferred location fall back to the default point
+    missing = np.flatnonzero(~flags.any(axis=1))
+    row_idx = np.concatenate([row_idx, missing])
+    loc_idx = np.concatenate([loc_idx, np.full(len(missing), len(locations))])
+
+    names = np.array(locations + ["Others"], dtype=object)
+    coordinates = np.array([location_coordinates.get(name, DEFAULT_COORDINATES) for name in names])
+
+    points = data.iloc[row_idx].copy()
+    points["Map Location"] = names[loc_idx]
+
+    # Fixed seed keeps markers from jumping around between reruns
+    jitter = np.random.default_rng(seed).uniform(-delta, delta, size=(len(points), 2))
+    points["Latitude"] = coordinates[loc_idx, 0] + jitter[:, 0]
+    points["Longitude"] = coordinates[loc_idx, 1] + jitter[:, 1]
+    return points
+
+def aggregate_by_location(points):
+    # Cluster counts per district, placed at the district centre
+    clusters = points.groupby("Map Location").size().rename("Applicants").reset_index()
+    centres = np.array([location_coordinates.get(name, DEFAULT_COORDINATES) for name in clusters["Map Location"]])
+    clusters["Latitude"] = centres[:, 0]
+    clusters["Longitude"] = centres[:, 1]
+    return clusters
 
 ############################################
-# 3) MAIN APP
+# 3) FIGURES (cached per data version and selected roles)
 ############################################
-def main():
-    st.title(":office: Job Role Analysis Dashboard with Advanced Filtering")
-    st.subheader("Select Job Roles")
-    
-    # โหลดข้อมูลสำหรับ multiselect
-    data = load_data()
-    job_roles = data["Desired Job Role"].unique()
-
-    selected_job_roles = st.multiselect(
-        "Select Job Roles Desired",
-        options=list(job_roles),
-        default=list(job_roles),
-    )
-    # ------------------------------------------------------------------------
-
-    # ข้อความอธิบายอื่น ๆ
-    st.write("Explore job roles, applicant demographics, expected salaries, and experience levels.")
-
-    # ลองคืนค่า data ให้ filtering ใช้ต่อ
-    # (ถ้าเลือก Job Roles ใด ๆ กรอง data ทันที)
-    if selected_job_roles:
-        filtered_data = data[data["Desired Job Role"].isin(selected_job_roles)]
-    else:
-        filtered_data = data
-
-    # เพิ่ม jitter lat/long และ Full Name
-    filtered_data = add_coordinates_with_jitter(filtered_data)
-    filtered_data["Full Name"] = filtered_data["First Name"] + " " + filtered_data["Last Name"]
-   
-
-    ##################################################
-    # Section 1: Gender Distribution
-    ##################################################
-    st.subheader("👥 Gender Distribution")
-    gender_images = {
-        "Male": "https://cdn-icons-png.flaticon.com/512/236/236831.png",
-        "Female": "https://cdn-icons-png.flaticon.com/512/6833/6833591.png",
-        "Other": "https://cdn-icons-png.flaticon.com/512/2620/2620829.png",
-    }
+# Shared across sessions; bounded so old filter states are evicted
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(max_entries=64)
 
-    gender_order = ["Male", "Female", "Other"]
-    gender_counts = (
-        filtered_data["Gender"]
-        .value_counts()
-        .reindex(gender_order)
-        .reset_index()
-    )
-    gender_counts.columns = ["Gender", "Count"]
-
-    cols = st.columns(len(gender_counts))
-    for i, row in gender_counts.iterrows():
-        with cols[i]:
-            st.image(
-                gender_images.get(row["Gender"], gender_images["Other"]), width=100
-            )
-            st.markdown(f"**{row['Gender']}**")
-            st.markdown(f"**{row['Count']} Applicants**")
+# Fingerprint of the loaded sheet, recomputed only when the data cache is cleared
+@st.cache_data
+def load_data_version():
+    return data_version(drop_indicator_columns(load_data()))
 
-    ##################################################
-    # Section 2: Tree Map for Job Roles
-    ##################################################
-    st.subheader("🗂️ Job Role Tree Map")
+def build_treemap(filtered_data):
     job_role_summary = (
-        filtered_data.groupby("Desired Job Role")
+        filtered_data.groupby("Desired Job Role", observed=True)
         .agg({"Expected Salary": "mean", "Desired Job Role": "count"})
         .rename(
             columns={
@@ -160,12 +124,9 @@ def main():
         paper_bgcolor="rgba(0,0,0,0)",
         font=dict(size=12, color="white"),
     )
-    st.plotly_chart(fig_tree, use_container_width=True)
+    return fig_tree
 
-    ##################################################
-    # Section 3: Bar Chart for Expected Salary (Top 10)
-    ##################################################
-    st.subheader("💰 Top 10 Expected Salaries")
+def build_salary_chart(filtered_data):
     top_salary_data = (
         filtered_data.sort_values(by="Expected Salary", ascending=False).head(10)
     )
@@ -188,12 +149,9 @@ def main():
         paper_bgcolor="rgba(0,0,0,0)",
         yaxis=dict(tickformat=",")
     )
-    st.plotly_chart(fig_salary, use_container_width=True)
+    return fig_salary
 
-    ##################################################
-    # Section 4: Horizontal Bar Chart (Experience, Top 10)
-    ##################################################
-    st.subheader("⏳ Top 10 Applicants by Years of Experience")
+def build_experience_chart(filtered_data):
     top_experience_data = (
         filtered_data.sort_values(by="Years of Experience", ascending=False).head(10)
     )
@@ -219,30 +177,148 @@ def main():
         plot_bgcolor="rgba(0,0,0,0)",
         paper_bgcolor="rgba(0,0,0,0)",
     )
+    return fig_experience
+
+def build_map(filtered_data):
+    map_points = add_coordinates_with_jitter(filtered_data)
+    if len(map_points) > MAP_MARKER_LIMIT:
+        fig_map = px.scatter_mapbox(
+            aggregate_by_location(map_points),
+            lat="Latitude",
+            lon="Longitude",
+            size="Applicants",
+            hover_name="Map Location",
+            hover_data={"Applicants": True, "Latitude": False, "Longitude": False},
+            color_discrete_sequence=["blue"],
+            zoom=10,
+            height=500,
+            title="🗺️ Applicants per Preferred Location",
+        )
+    else:
+        fig_map = px.scatter_mapbox(
+            map_points,
+            lat="Latitude",
+            lon="Longitude",
+            hover_name="Full Name",
+            hover_data={"Map Location": True, "Desired Job Role": True},
+            color_discrete_sequence=["blue"],
+            zoom=10,
+            height=500,
+            title="🗺️ Applicant Locations by Preferred Location",
+        )
+    fig_map.update_layout(
+        mapbox_style="open-street-map",
+        margin={"r": 0, "t": 50, "l": 0, "b": 0},
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig_map
+
+############################################
+# 4) MAIN APP
+############################################
+def main():
+    st.title(":office: Job Role Analysis Dashboard with Advanced Filtering")
+    st.subheader("Select Job Roles")
+    
+    # โหลดข้อมูลสำหรับ multiselect
+    data = load_data()
+    job_roles = data["Desired Job Role"].dropna().unique()
+
+    selected_job_roles = st.multiselect(
+        "Select Job Roles Desired",
+        options=list(job_roles),
+        default=list(job_roles),
+    )
+    # ------------------------------------------------------------------------
+
+    # ข้อความอธิบายอื่น ๆ
+    st.write("Explore job roles, applicant demographics, expected salaries, and experience levels.")
+
+    # ลองคืนค่า data ให้ filtering ใช้ต่อ
+    # (ถ้าเลือก Job Roles ใด ๆ กรอง data ทันที)
+    if selected_job_roles:
+        filtered_data = data[data["Desired Job Role"].isin(selected_job_roles)]
+    else:
+        filtered_data = data
+
+    # เพิ่ม Full Name
+    filtered_data = filtered_data.copy()
+    filtered_data["Full Name"] = filtered_data["First Name"] + " " + filtered_data["Last Name"]
+
+    # Figures are only rebuilt when the data or the role selection changes
+    figure_cache = get_figure_cache()
+    version = load_data_version()
+    roles_key = tuple(sorted(selected_job_roles))
+   
+
+    ##################################################
+    # Section 1: Gender Distribution
+    ##################################################
+    st.subheader("👥 Gender Distribution")
+    gender_images = {
+        "Male": "https://cdn-icons-png.flaticon.com/512/236/236831.png",
+        "Female": "https://cdn-icons-png.flaticon.com/512/6833/6833591.png",
+        "Other": "https://cdn-icons-png.flaticon.com/512/2620/2620829.png",
+    }
+
+    gender_order = ["Male", "Female", "Other"]
+    gender_counts = (
+        filtered_data["Gender"]
+        .value_counts()
+        .reindex(gender_order)
+        .reset_index()
+    )
+    gender_counts.columns = ["Gender", "Count"]
+
+    cols = st.columns(len(gender_counts))
+    for i, row in gender_counts.iterrows():
+        with cols[i]:
+            st.image(
+                gender_images.get(row["Gender"], gender_images["Other"]), width=100
+            )
+            st.markdown(f"**{row['Gender']}**")
+            st.markdown(f"**{row['Count']} Applicants**")
+
+    ##################################################
+    # Section 2: Tree Map for Job Roles
+    ##################################################
+    st.subheader("🗂️ Job Role Tree Map")
+    fig_tree = figure_cache.get_or_build(
+        ("treemap", version, roles_key), lambda: build_treemap(filtered_data)
+    )
+    st.plotly_chart(fig_tree, use_container_width=True)
+
+    ##################################################
+    # Section 3: Bar Chart for Expected Salary (Top 10)
+    ##################################################
+    st.subheader("💰 Top 10 Expected Salaries")
+    fig_salary = figure_cache.get_or_build(
+        ("salary", version, roles_key), lambda: build_salary_chart(filtered_data)
+    )
+    st.plotly_chart(fig_salary, use_container_width=True)
+
+    ##################################################
+    # Section 4: Horizontal Bar Chart (Experience, Top 10)
+    ##################################################
+    st.subheader("⏳ Top 10 Applicants by Years of Experience")
+    fig_experience = figure_cache.get_or_build(
+        ("experience", version, roles_key), lambda: build_experience_chart(filtered_data)
+    )
     st.plotly_chart(fig_experience, use_container_width=True)
 
     ##################################################
     # Section 5: Map Visualization
     ##################################################
     st.subheader("🗺️ Map of Applicant Locations")
-    fig_map = px.scatter_mapbox(
-        filtered_data,
-        lat="Latitude",
-        lon="Longitude",
-        hover_name="Full Name",
-        hover_data={"Preferred Location": True, "Desired Job Role": True},
-        color_discrete_sequence=["blue"],
-        zoom=5,
-        height=500,
-        title="🗺️ Applicant Locations by Preferred Location",
-    )
-    fig_map.update_layout(
-        mapbox_style="open-street-map",
-        margin={"r": 0, "t": 50, "l": 0, "b": 0},
-        paper_bgcolor="rgba(0,0,0,0)",
+    fig_map = figure_cache.get_or_build(
+        ("map", version, roles_key), lambda: build_map(filtered_data)
     )
     st.plotly_chart(fig_map, use_container_width=True)
 
+    with st.expander("⏱️ Figure cache timings"):
+        st.caption(f"{len(figure_cache)} of {figure_cache.max_entries} cached figures in use")
+        st.dataframe(pd.DataFrame.from_dict(figure_cache.stats, orient="index"))
+
     ##################################################
     # ADVANCED FILTERING SECTION
     ##################################################
@@ -252,41 +328,36 @@ def main():
         max_salary = st.number_input("Maximum Expected Salary (THB)", min_value=0, value=1000000)
         min_experience = st.number_input("Minimum Years of Experience", min_value=0, value=0)
 
-        education_options = data["Highest Level of Education"].unique()
+        education_options = list(data["Highest Level of Education"].dropna().unique())
         selected_education = st.multiselect(
             "Select Education Levels",
             options=education_options,
             default=education_options,
         )
 
-        # Languages
-        all_languages = set()
-        for langs in data["Languages"]:
-            lang_list = [x.strip() for x in langs.split(",")]
-            for lang in lang_list:
-                all_languages.add(lang)
-        unique_languages = sorted(list(all_languages))
+        # Multi-valued columns: options come from the parsed indicator columns
+        unique_languages = indicator_options(data, "Languages")
         selected_languages = st.multiselect(
             "Select Languages",
             options=unique_languages,
             default=unique_languages,
         )
 
-        environment_options = data["Work Environment"].unique()
+        environment_options = indicator_options(data, "Work Environment")
         selected_environments = st.multiselect(
             "Select Work Environments",
             options=environment_options,
             default=environment_options,
         )
 
-        job_type_options = data["Job Type"].unique()
+        job_type_options = indicator_options(data, "Job Type")
         selected_job_types = st.multiselect(
             "Select Job Types",
             options=job_type_options,
             default=job_type_options,
         )
 
-        location_options = data["Preferred Location"].unique()
+        location_options = indicator_options(data, "Preferred Location")
         selected_locations = st.multiselect(
             "Select Preferred Locations",
             options=location_options,
@@ -302,29 +373,39 @@ def main():
 
         submit_button = st.form_submit_button("Apply Filters")
 
+    # Keep the submitted filters so the results (and their export) survive reruns
     if submit_button:
-        def has_selected_language(langs_str, selected_set):
-            lang_list = [x.strip() for x in langs_str.split(",")]
-            return len(set(lang_list).intersection(selected_set)) > 0
-
-        lang_set = set(selected_languages)
-
-        advanced_filtered_data = filtered_data[
-            (filtered_data["Expected Salary"] >= min_salary)
-            & (filtered_data["Expected Salary"] <= max_salary)
-            & (filtered_data["Years of Experience"] >= min_experience)
-            & (filtered_data["Highest Level of Education"].isin(selected_education))
-            & (filtered_data["Languages"].apply(lambda x: has_selected_language(x, lang_set)))
-            & (filtered_data["Work Environment"].isin(selected_environments))
-            & (filtered_data["Job Type"].isin(selected_job_types))
-            & (filtered_data["Preferred Location"].isin(selected_locations))
-            & (filtered_data["Near BTS/MRT Line"].isin(selected_bts))
-        ]
+        st.session_state["advanced_filters"] = dict(
+            min_salary=min_salary,
+            max_salary=max_salary,
+            min_experience=min_experience,
+            education=selected_education,
+            near_bts=selected_bts,
+            multi_values={
+                "Languages": selected_languages,
+                "Work Environment": selected_environments,
+                "Job Type": selected_job_types,
+                "Preferred Location": selected_locations,
+            },
+        )
+
+    if st.session_state.get("advanced_filters") is not None:
+        # Vectorized mask; a multi-valued filter matches any of the selected values
+        mask = build_filter_mask(filtered_data, **st.session_state["advanced_filters"])
+        advanced_filtered_data = drop_indicator_columns(filtered_data[mask])
 
         st.subheader("📋 Filtered Applicants")
         st.write(f"Total Applicants Found: {len(advanced_filtered_data)}")
         st.dataframe(advanced_filtered_data)
 
+        # Export exactly the rows selected by the same mask
+        render_export_controls(
+            advanced_filtered_data.drop(columns=["Full Name"]),
+            key="filtered_applicants",
+            file_stem="filtered_applicants",
+            data_version=version,
+        )
+
 if __name__ == "__main__":
     main()
 
@@ -1,16 +1,28 @@
 import streamlit as st
 import pandas as pd
-import pdfplumber
-
-from langchain_community.document_loaders import UnstructuredPDFLoader
-from langchain_ollama import OllamaEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import Chroma
-from langchain.prompts import ChatPromptTemplate, PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_ollama.chat_models import ChatOllama
-from langchain_core.runnables import RunnablePassthrough
-from langchain.retrievers.multi_query import MultiQueryRetriever
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from llm_gateway import SESSION_HEADER, GatewayClient
+from conversation_memory import RetrievalMemory, compress_history, is_follow_up
+from applicant_schema import JOB_ROLES
+
+# Heavy modules (Unstructured, Chroma, LangChain, pdfplumber) are imported inside the
+# functions that use them, so the page renders before they are loaded.
+HEAVY_IMPORTS = [
+    "pdfplumber",
+    "langchain_community.document_loaders",
+    "unstructured.partition.pdf",
+    "langchain_ollama",
+    "langchain_text_splitters",
+    "langchain_community.vectorstores",
+    "langchain.prompts",
+    "langchain_core.output_parsers",
+    "langchain_ollama.chat_models",
+    "langchain_core.runnables",
+    "langchain.retrievers.multi_query",
+]
 
 # Suppress warnings
 import warnings
@@ -37,43 +49,104 @@ st.set_page_config(
 #AI model
 selected_model = "llama3.2"
 
+# Vector backend: "chroma" (in-memory per session) or "quantized" (memory-mapped index on disk,
+# shared read-only by every process; see quantized_store.py)
+vector_backend = os.environ.get("VECTOR_BACKEND", "chroma")
+vector_index_dir = os.environ.get("VECTOR_INDEX_DIR", ".vector_index")
+
+# Optional queueing gateway in front of Ollama (see llm_gateway.py); unset = talk to Ollama directly
+gateway_url = os.environ.get("LLM_GATEWAY_URL")
+
+# Import the heavy modules once per server process in a background thread, so they are
+# usually warm in sys.modules by the time the user picks a job role or asks a question
+def _warm_imports():
+    import importlib
+    for module in HEAVY_IMPORTS:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+@st.cache_resource
+def start_import_warmup():
+    thread = threading.Thread(target=_warm_imports, name="ai-page-import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+# One open index per job role and build, shared across sessions of this process; a rebuild
+# (even with the same resume set, e.g. ingest_resumes.py --force) has a new build id
+@st.cache_resource(max_entries=32)
+def open_quantized_index(index_path, fingerprint, build_id):
+    from langchain_ollama import OllamaEmbeddings
+    from quantized_store import QuantizedVectorStore
+    return QuantizedVectorStore.load(index_path, OllamaEmbeddings(model="nomic-embed-text"))
+
+@st.cache_resource
+def index_build_lock():
+    return threading.Lock()
+
+def load_resume_chunks(pdf_files):
+    from langchain_community.document_loaders import UnstructuredPDFLoader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    data = []
+    total_chunks = []
+
+    # Load PDF files
+    for pdf_file in pdf_files:
+        loader = UnstructuredPDFLoader(file_path=pdf_file)
+        pdf_data = loader.load()
+        data.append(pdf_data)
+        relative_path = os.path.relpath(pdf_file, start="uploaded_resumes")
+        st.markdown(f"PDF loaded successfully: {relative_path}")
+
+    # Split text into chunks
+    for pdf_data in data:
+        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+        chunks = text_splitter.split_documents(pdf_data)
+        total_chunks.append(chunks)
+        # st.text(f"Text split into {len(chunks)} chunks")
+        # st.text(chunks)
+
+    # Flatten the list of chunks
+    return [chunk for sublist in total_chunks for chunk in sublist]
+
 def create_vector_db():
-    job_roles = [
-            "",  # Blank option
-            "Software Development", "Data Science", "Product Management", "Design", 
-            "Marketing", "Sales", "Human Resources", "Customer Support", 
-            "Finance", "Project Management", "Content Creation", "UI/UX Design", 
-            "Business Analysis", "Engineering", "Cybersecurity", "Operations", 
-            "Production", "Other"
-        ]
+    job_roles = [""] + JOB_ROLES  # Blank option first
 
     job_role = st.selectbox("Please select job role from dropdown", job_roles, key="job_role")
+    # No role selected yet: a recursive glob of the resume root would match every role's PDFs
+    if job_role == "":
+        return None
+
     with st.spinner(":green[Loading...]"):
         folder_path = os.path.join("uploaded_resumes", job_role)
-        pdf_files = glob.glob(os.path.join(folder_path, "*.pdf"))
+        pdf_files = glob.glob(os.path.join(folder_path, "**", "*.pdf"), recursive=True)
 
-        data = []
-        total_chunks = []
         if pdf_files:
+            from langchain_ollama import OllamaEmbeddings
+
+            if vector_backend == "quantized":
+                from quantized_store import QuantizedVectorStore, current_build_id, index_is_current
+                from resume_files import folder_fingerprint
+
+                index_path = os.path.join(vector_index_dir, job_role)
+                fingerprint = folder_fingerprint(folder_path)
+                with index_build_lock():
+                    if not index_is_current(index_path, fingerprint):
+                        QuantizedVectorStore.from_documents(
+                            documents=load_resume_chunks(pdf_files),
+                            embedding=OllamaEmbeddings(model="nomic-embed-text"),
+                            path=index_path,
+                            extra_meta={"fingerprint": fingerprint},
+                        )
+                vector_db = open_quantized_index(index_path, fingerprint, current_build_id(index_path))
+                st.markdown(f"Resume index loaded ({len(vector_db.index)} chunks), let's chat!")
+                return vector_db
 
-            # Load PDF files
-            for pdf_file in pdf_files:
-                loader = UnstructuredPDFLoader(file_path=pdf_file)
-                pdf_data = loader.load()
-                data.append(pdf_data)
-                relative_path = os.path.relpath(pdf_file, start="uploaded_resumes")
-                st.markdown(f"PDF loaded successfully: {relative_path}")
-
-            # Split text into chunks
-            for pdf_data in data:
-                text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-                chunks = text_splitter.split_documents(pdf_data)
-                total_chunks.append(chunks)
-                # st.text(f"Text split into {len(chunks)} chunks")
-                # st.text(chunks)
-
-            # Flatten the list of chunks
-            all_chunks = [chunk for sublist in total_chunks for chunk in sublist]
+            from langchain_community.vectorstores import Chroma
+
+            all_chunks = load_resume_chunks(pdf_files)
             
             # Create vector database using all chunks
             vector_db = Chroma.from_documents(
@@ -84,15 +157,28 @@ def create_vector_db():
             st.markdown("Vector database created successfully, let's chat!")
             return vector_db
 
-        elif job_role == "":
-            st.markdown("")
         else:
             st.markdown("There is no resume uploaded in the selected job role.")
 
-def process_question(question, vector_db):
-    
+def chat_model_kwargs(session_id=None):
+    if not gateway_url:
+        return {}
+    return {"base_url": gateway_url, "client_kwargs": {"headers": {SESSION_HEADER: session_id or ""}}}
+
+def format_context(documents):
+    return "\n\n".join(
+        f"[Candidate: {os.path.basename(doc.metadata.get('source', 'unknown'))}]\n{doc.page_content}"
+        for doc in documents
+    )
+
+def process_question(question, vector_db, session_id=None, memory=None, history="", cancelled=None):
+    from langchain.prompts import ChatPromptTemplate, PromptTemplate
+    from langchain.retrievers.multi_query import MultiQueryRetriever
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_ollama.chat_models import ChatOllama
+
     # Initialize LLM
-    llm = ChatOllama(model=selected_model)
+    llm = ChatOllama(model=selected_model, **chat_model_kwargs(session_id))
     
     # Query prompt template
     QUERY_PROMPT = PromptTemplate(
@@ -106,34 +192,91 @@ def process_question(question, vector_db):
         Original question: {question}""",
     )
 
-    # Set up retriever
-    retriever = MultiQueryRetriever.from_llm(
-        vector_db.as_retriever(), 
-        llm,
-        prompt=QUERY_PROMPT
-    )
+    # Set when the user abandons the question; an orphaned worker then stops before its next
+    # model request and leaves the session's memory to the next question
+    def stop_requested():
+        return cancelled is not None and cancelled.is_set()
+
+    # Follow-ups ("and which of them...") stay within the candidates found earlier and
+    # reuse their chunks, skipping the extra LLM call for multi-query generation
+    if memory and is_follow_up(question):
+        scoped = vector_db.as_retriever(search_kwargs={"filter": memory.search_filter()})
+        retrieved = scoped.invoke(question)
+        seen = {doc.page_content for doc in retrieved}
+        documents = [doc for doc in memory.chunks if doc.page_content not in seen] + retrieved
+    else:
+        if stop_requested():
+            return None
+        retriever = MultiQueryRetriever.from_llm(
+            vector_db.as_retriever(), 
+            llm,
+            prompt=QUERY_PROMPT
+        )
+        retrieved = retriever.invoke(question)
+        documents = retrieved
+    if stop_requested():
+        return None
+    if memory is not None:
+        memory.remember(retrieved)
 
     # RAG prompt template
     template = """Answer the question based ONLY on the following context:
     {context}
+    Conversation so far:
+    {history}
     Question: {question}
     """
 
     prompt = ChatPromptTemplate.from_template(template)
 
     # Create chain
-    chain = (
-        {"context": retriever, "question": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
+    chain = prompt | llm | StrOutputParser()
 
-    response = chain.invoke(question)
+    if stop_requested():
+        return None
+    response = chain.invoke({"context": format_context(documents), "history": history, "question": question})
     return response
 
+# Run the question in a worker thread and report the gateway queue position while it waits
+def answer_with_queue_status(question, vector_db, session_id, memory=None, history=""):
+    if not gateway_url:
+        return process_question(question, vector_db, session_id, memory, history)
+
+    client = GatewayClient(gateway_url)
+    status_placeholder = st.empty()
+    executor = ThreadPoolExecutor(max_workers=1)
+    cancelled = threading.Event()
+    future = executor.submit(process_question, question, vector_db, session_id, memory, history, cancelled)
+    try:
+        while not future.done():
+            try:
+                status = client.session_status(session_id)
+            except OSError:
+                status = None
+            if status and status["queued_positions"]:
+                status_placeholder.info(
+                    f"⏳ Waiting for the model: position {status['queued_positions'][0]} of {status['queue_length']} in queue"
+                )
+            elif status and status["running"]:
+                status_placeholder.info("🧠 The model is working on your question...")
+            time.sleep(0.5)
+        status_placeholder.empty()
+        return future.result()
+    finally:
+        # Streamlit stops this script (BaseException) when the user navigates away or reruns
+        if not future.done():
+            # Stop the worker from sending further requests before dropping the current ones
+            cancelled.set()
+            try:
+                client.cancel_session(session_id)
+            except OSError:
+                pass
+        executor.shutdown(wait=False)
+
 @st.cache_data
 def extract_all_pages_as_images(pdf_file):
+    import pdfplumber
+
     pdf_pages = []
     with pdfplumber.open(pdf_file) as pdf:
         pdf_pages = [page.to_image().original for page in pdf.pages]
@@ -141,6 +284,8 @@ def extract_all_pages_as_images(pdf_file):
 
 # Main function
 def main():
+    start_import_warmup()
+
     # Create layout
     st.markdown("## 🤖 **Resume Chat Pro - Local AI Companion on your workspace**")
     st.markdown("""
@@ -154,6 +299,10 @@ def main():
         st.session_state["vector_db"] = None
     if "messages" not in st.session_state:
         st.session_state["messages"] = []
+    if "session_id" not in st.session_state:
+        st.session_state["session_id"] = uuid.uuid4().hex
+    if "retrieval_memory" not in st.session_state:
+        st.session_state["retrieval_memory"] = RetrievalMemory()
 
     # Clear vector DB if switching between job roles
     if st.session_state["vector_db"] is not None:
@@ -163,6 +312,15 @@ def main():
     # Create vector DB
     st.session_state["vector_db"] = create_vector_db()
 
+    # Earlier retrievals only apply to the job role they were made for
+    memory = st.session_state["retrieval_memory"]
+    if memory.scope != st.session_state.get("job_role"):
+        memory.reset(st.session_state.get("job_role"))
+
+    # Explicit reset: the next question searches all resumes again instead of the earlier candidates
+    if memory and st.button("🆕 New question", help="Forget the candidates found in earlier answers"):
+        memory.reset(memory.scope)
+
     #chat interface
     message_container = st.container()
     for i, message in enumerate(st.session_state["messages"]):
@@ -179,6 +337,9 @@ def main():
     # Chat input and processing
     if prompt := st.chat_input("Enter a prompt here...", key="chat_input"):
         try:
+            # Bounded summary of earlier turns, taken before the new question is added
+            history = compress_history(st.session_state["messages"])
+
             # Add user message to chat
             st.session_state["messages"].append({"role": "user", "content": prompt})
             with message_container.chat_message("user", avatar="😎"):
@@ -188,8 +349,9 @@ def main():
             with message_container.chat_message("assistant", avatar="🤖"):
                 with st.spinner(":green[processing...]"):
                     if st.session_state["vector_db"] is not None:
-                        response = process_question(
-                            prompt, st.session_state["vector_db"]
+                        response = answer_with_queue_status(
+                            prompt, st.session_state["vector_db"], st.session_state["session_id"],
+                            memory, history,
                         )
                         st.markdown(response)
                     else:
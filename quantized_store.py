@@ -0,0 +1,325 @@
+"""Quantized, memory-mapped vector storage for resume chunks.
+
+An index directory holds one sub-directory per build (``v-<build id>``) and a
+``current`` file naming the live build. A rebuild writes a new build and then
+replaces ``current`` atomically, so readers never see a missing or half-written
+index, and handles opened on the previous build keep reading its files. Each
+build is a directory of plain files:
+
+    meta.json      dtype, dimension, count, source names, embedding model
+    vectors.npy    unit-normalized embeddings as int8 (with scales.npy) or float16
+    scales.npy     per-row dequantization scale (int8 only)
+    sources.npy    int32 code of each chunk's source file, for metadata filters
+    chunks.jsonl   chunk text and metadata, one JSON object per line
+    offsets.npy    byte offset of each line in chunks.jsonl
+    ivf_*.npy      optional inverted-file (IVF) index for approximate search
+
+Arrays are opened with ``mmap_mode="r"``, so every Streamlit process shares the
+same OS page cache instead of holding its own float32 copy, and chunk text is
+read from disk only for the hits that are returned.
+"""
+import json
+import mmap
+import os
+import shutil
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+INDEX_DTYPES = ("int8", "float16")
+SEARCH_BLOCK_ROWS = 65536
+CURRENT_FILE = "current"
+
+
+def current_build_id(path):
+    """Name of the live build of the index at ``path``, or None if it has none."""
+    try:
+        with open(os.path.join(path, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _build_path(path, build_id):
+    # Indexes written before builds were versioned keep their files directly in ``path``
+    return os.path.join(path, build_id) if build_id else path
+
+
+def _remove_old_builds(path, keep):
+    """Delete finished builds not in ``keep`` and files of the unversioned layout.
+
+    In-progress builds (``*.building``) of other processes are left alone. Processes
+    that still map deleted files keep reading them until they close them.
+    """
+    for name in os.listdir(path):
+        full = os.path.join(path, name)
+        if name in keep or name == CURRENT_FILE or name.endswith((".building", ".tmp")):
+            continue
+        if name.startswith("v-") and os.path.isdir(full):
+            shutil.rmtree(full, ignore_errors=True)
+        elif os.path.isfile(full) and (name == "meta.json" or name.endswith((".npy", ".jsonl"))):
+            os.remove(full)
+
+
+def index_is_current(path, fingerprint):
+    meta_path = os.path.join(_build_path(path, current_build_id(path)), "meta.json")
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f).get("fingerprint") == fingerprint
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def quantize(vectors, dtype="int8"):
+    """Return (quantized, scales); scales is None for float16."""
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def kmeans(vectors, n_clusters, iterations=10, seed=42, sample_size=50000):
+    """Spherical k-means on unit vectors, trained on a sample."""
+    rng = np.random.default_rng(seed)
+    sample = vectors if len(vectors) <= sample_size else vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(n_clusters):
+            members = sample[assignment == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+        centroids = normalize(centroids)
+    return centroids
+
+
+def _top_k(scores, ids, k):
+    if len(scores) <= k:
+        order = np.argsort(-scores)
+    else:
+        part = np.argpartition(-scores, k - 1)[:k]
+        order = part[np.argsort(-scores[part])]
+    return scores[order], ids[order]
+
+
+class QuantizedIndex:
+    """Read-only, memory-mapped index over quantized embeddings."""
+
+    def __init__(self, path):
+        self.path = path
+        # Resolved once: this handle keeps reading the same build after a rebuild swaps it out
+        self.build_id = current_build_id(path)
+        self.data_path = path = _build_path(path, self.build_id)
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.scales = (
+            np.load(os.path.join(path, "scales.npy"), mmap_mode="r") if self.meta["dtype"] == "int8" else None
+        )
+        self.sources = np.load(os.path.join(path, "sources.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        self.source_names = self.meta["sources"]
+        self.source_codes = {name: code for code, name in enumerate(self.source_names)}
+        self.ivf = None
+        if os.path.exists(os.path.join(path, "ivf_centroids.npy")):
+            self.ivf = {
+                name: np.load(os.path.join(path, f"ivf_{name}.npy"), mmap_mode="r")
+                for name in ("centroids", "order", "offsets")
+            }
+        # Chunk text is mapped once too, never reopened by path
+        self._chunks = b""
+        with open(os.path.join(path, "chunks.jsonl"), "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                self._chunks = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return int(self.meta["count"])
+
+    @staticmethod
+    def build(path, embeddings, texts, metadatas, dtype="int8", ivf_lists=None, model=None, extra_meta=None):
+        """Write a new build of the index at ``path`` and make it current.
+
+        ``ivf_lists=0`` disables the IVF index, None picks sqrt(n). The build that
+        was current until now is kept for readers that resolved it just before the
+        swap; older builds are deleted.
+        """
+        if dtype not in INDEX_DTYPES:
+            raise ValueError(f"dtype must be one of {INDEX_DTYPES}, got {dtype!r}")
+        os.makedirs(path, exist_ok=True)
+        build_id = f"v-{time.time_ns():x}-{os.getpid()}"
+        staging = os.path.join(path, f"{build_id}.building")
+        os.makedirs(staging)
+        try:
+            QuantizedIndex._write_build(staging, embeddings, texts, metadatas, dtype, ivf_lists, model, extra_meta)
+            os.rename(staging, os.path.join(path, build_id))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        # Point ``current`` at the new build with an atomic replace
+        previous = current_build_id(path)
+        pointer_tmp = os.path.join(path, f"{CURRENT_FILE}.{build_id}.tmp")
+        with open(pointer_tmp, "w", encoding="utf-8") as f:
+            f.write(build_id)
+        os.replace(pointer_tmp, os.path.join(path, CURRENT_FILE))
+        _remove_old_builds(path, keep={build_id, previous})
+        return QuantizedIndex(path)
+
+    @staticmethod
+    def _write_build(path, embeddings, texts, metadatas, dtype, ivf_lists, model, extra_meta):
+        vectors = normalize(embeddings)
+        quantized, scales = quantize(vectors, dtype)
+
+        source_names = sorted({m.get("source", "") for m in metadatas})
+        codes = {name: code for code, name in enumerate(source_names)}
+        sources = np.array([codes[m.get("source", "")] for m in metadatas], dtype=np.int32)
+
+        offsets = []
+        with open(os.path.join(path, "chunks.jsonl"), "wb") as f:
+            for text, metadata in zip(texts, metadatas):
+                offsets.append(f.tell())
+                f.write(json.dumps({"text": text, "metadata": metadata}, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        np.save(os.path.join(path, "vectors.npy"), quantized)
+        if scales is not None:
+            np.save(os.path.join(path, "scales.npy"), scales)
+        np.save(os.path.join(path, "sources.npy"), sources)
+        np.save(os.path.join(path, "offsets.npy"), np.array(offsets, dtype=np.int64))
+
+        if ivf_lists is None:
+            ivf_lists = int(np.sqrt(len(vectors))) if len(vectors) >= 1024 else 0
+        if ivf_lists:
+            centroids = kmeans(vectors, min(ivf_lists, len(vectors)))
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable").astype(np.int64)
+            list_offsets = np.searchsorted(assignment[order], np.arange(len(centroids) + 1))
+            np.save(os.path.join(path, "ivf_centroids.npy"), centroids)
+            np.save(os.path.join(path, "ivf_order.npy"), order)
+            np.save(os.path.join(path, "ivf_offsets.npy"), list_offsets.astype(np.int64))
+
+        meta = {"dtype": dtype, "dim": int(vectors.shape[1]), "count": int(len(vectors)),
+                "sources": source_names, "model": model, **(extra_meta or {})}
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def _score(self, rows, query):
+        scores = self.vectors[rows].astype(np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales[rows]
+        return scores
+
+    def _allowed(self, rows, source_codes):
+        if source_codes is None:
+            return rows
+        return rows[np.isin(self.sources[rows], source_codes)]
+
+    def search(self, query, k=4, source_codes=None, nprobe=8, exact=False):
+        """Return (scores, row ids) of the k most similar chunks to ``query``."""
+        query = normalize(query)
+        # A source filter (e.g. a follow-up over a few candidates) is searched exactly: their
+        # chunks are spread over many IVF lists, so probing nprobe of them would miss most
+        if self.ivf is not None and not exact and source_codes is None:
+            probes = np.argsort(-(self.ivf["centroids"] @ query))[:nprobe]
+            offsets = self.ivf["offsets"]
+            rows = np.sort(np.concatenate([self.ivf["order"][offsets[p]:offsets[p + 1]] for p in probes]))
+            return _top_k(self._score(rows, query), rows, k)
+
+        best_scores = np.zeros(0, dtype=np.float32)
+        best_ids = np.zeros(0, dtype=np.int64)
+        # Dequantize block by block so a search never materializes the whole matrix
+        for start in range(0, len(self), SEARCH_BLOCK_ROWS):
+            stop = min(start + SEARCH_BLOCK_ROWS, len(self))
+            rows = self._allowed(np.arange(start, stop), source_codes)
+            if not len(rows):
+                continue
+            # Unfiltered blocks are contiguous, so slice the memory map instead of gathering rows
+            scores = self._score(slice(start, stop) if source_codes is None else rows, query)
+            scores, ids = _top_k(scores, rows, k)
+            best_scores, best_ids = _top_k(np.concatenate([best_scores, scores]), np.concatenate([best_ids, ids]), k)
+        return best_scores, best_ids
+
+    def chunk(self, row):
+        start = int(self.offsets[row])
+        return json.loads(self._chunks[start:self._chunks.find(b"\n", start)])
+
+
+class QuantizedVectorStore(VectorStore):
+    """LangChain vector store over a QuantizedIndex, usable wherever the page uses Chroma.
+
+    Supports ``filter={"source": path}`` and ``filter={"source": {"$in": [...]}}``.
+    """
+
+    def __init__(self, index, embedding, nprobe=8):
+        self.index = index
+        self._embedding = embedding
+        self.nprobe = nprobe
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    @classmethod
+    def load(cls, path, embedding, **kwargs):
+        return cls(QuantizedIndex(path), embedding, **kwargs)
+
+    @classmethod
+    def from_documents(cls, documents, embedding, path=None, dtype="int8", ivf_lists=None, extra_meta=None, **kwargs):
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        return cls.from_texts(texts, embedding, metadatas, path=path, dtype=dtype, ivf_lists=ivf_lists,
+                              extra_meta=extra_meta, **kwargs)
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, path=None, dtype="int8", ivf_lists=None, extra_meta=None,
+                   **kwargs):
+        if path is None:
+            raise ValueError("QuantizedVectorStore needs an index directory (path=...)")
+        metadatas = metadatas or [{} for _ in texts]
+        vectors = embedding.embed_documents(list(texts))
+        index = QuantizedIndex.build(path, vectors, list(texts), metadatas, dtype=dtype, ivf_lists=ivf_lists,
+                                     model=getattr(embedding, "model", None), extra_meta=extra_meta)
+        return cls(index, embedding, **kwargs)
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        raise NotImplementedError("Quantized indexes are read-only; rebuild them with the ingestion CLI")
+
+    def delete_collection(self):
+        # The index files are shared by every process; dropping a handle must not delete them
+        pass
+
+    def _source_codes(self, filter):
+        if not filter:
+            return None
+        wanted = filter.get("source")
+        if isinstance(wanted, dict):
+            wanted = wanted.get("$in", [])
+        elif wanted is not None:
+            wanted = [wanted]
+        else:
+            raise ValueError(f"Unsupported filter: {filter}")
+        return np.array([self.index.source_codes[s] for s in wanted if s in self.index.source_codes], dtype=np.int32)
+
+    def similarity_search_with_score(self, query, k=4, filter=None, **kwargs):
+        query_vector = np.asarray(self._embedding.embed_query(query), dtype=np.float32)
+        scores, rows = self.index.search(query_vector, k=k, source_codes=self._source_codes(filter), nprobe=self.nprobe)
+        results = []
+        for score, row in zip(scores, rows):
+            chunk = self.index.chunk(row)
+            results.append((Document(page_content=chunk["text"], metadata=chunk["metadata"]), float(score)))
+        return results
+
+    def similarity_search(self, query, k=4, filter=None, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are cosine similarities already
+        return lambda score: score
@@ -0,0 +1,20 @@
+import glob
+import hashlib
+import json
+import os
+
+RESUME_FOLDER = "uploaded_resumes"
+
+
+def list_resumes(folder=RESUME_FOLDER):
+    """Map each resume (path relative to ``folder``) to a fingerprint of its file."""
+    resumes = {}
+    for path in glob.glob(os.path.join(folder, "**", "*.pdf"), recursive=True):
+        stat = os.stat(path)
+        resumes[os.path.relpath(path, start=folder)] = f"{stat.st_size}:{int(stat.st_mtime)}"
+    return resumes
+
+
+def folder_fingerprint(folder):
+    """Hash of the PDF names, sizes and mtimes under ``folder``."""
+    return hashlib.sha1(json.dumps(sorted(list_resumes(folder).items())).encode("utf-8")).hexdigest()